@@ -1,5 +1,6 @@
 """Main entry point for the application."""
 
+import multiprocessing
 import sys
 import os
 
@@ -68,4 +69,6 @@ def main():
 
 
 if __name__ == '__main__':
+    # Required for spawned browser processes when running as a frozen executable
+    multiprocessing.freeze_support()
     main()
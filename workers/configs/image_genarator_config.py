@@ -19,7 +19,12 @@ class ImageGeneratorConstants:
     SLEEP_BEFORE_SCROLL = 1
     SLEEP_FOR_PREPARE_UPLOAD = random.randint(5, 10)
     SLEEP_AFTER_DELETE = 1
-    MAX_GENERATION_CHECK = 10
+
+    # Generation polling: interval grows by GENERATION_CHECK_BACKOFF from
+    # GENERATION_CHECK_MIN_INTERVAL up to SLEEP_AFTER_GENERATION_CHECK
+    MAX_GENERATION_SECONDS = 50
+    GENERATION_CHECK_MIN_INTERVAL = 1
+    GENERATION_CHECK_BACKOFF = 1.3
 
     # CSS Selectors (using stable attributes instead of classes where possible)
     # Note: Some selectors may still use classes, but we prefer stable attributes like type, accept, aria-label
@@ -1,6 +1,5 @@
 """Example Worker that uses GPM service with multiprocessing."""
 
-import multiprocessing
 import queue
 import threading
 from typing import Optional
@@ -52,7 +51,7 @@ class GPMWorker(Worker):
             from workers.no_drive_services.browser_services.gpm_service import GPMService
 
             self.status.emit("Initializing GPM service...")
-            self.progress.emit(10)
+            self.emit_progress(10)
 
             if self.should_stop():
                 return
@@ -60,12 +59,12 @@ class GPMWorker(Worker):
             # Create GPMService here (in QThread context)
             self.gpm_service = GPMService()
 
-            # Set up cross-process log forwarding
-            self.log_queue = multiprocessing.Queue()
+            # Set up cross-process log forwarding (same start-method context as the browser processes)
+            self.log_queue = self.gpm_service.mp_context.Queue()
             self._start_log_listener()
 
             self.status.emit(f"Launching {len(self.accounts)} browsers...")
-            self.progress.emit(20)
+            self.emit_progress(20)
 
             # Launch multiple browsers in parallel processes
             processes = self.gpm_service.launch_multiple_browsers(
@@ -76,7 +75,7 @@ class GPMWorker(Worker):
 
             # Hide overlay when browsers are launched (launch_multiple_browsers returns)
             # Emit 100% progress to trigger hideLoading in the UI
-            self.progress.emit(100)
+            self.emit_progress(100)
             self.status.emit(f"✅ {len(processes)} browsers launched successfully")
 
             # Wait for browsers to actually start and become alive
@@ -139,7 +138,7 @@ class GPMWorker(Worker):
             if self.should_stop():
                 self.status.emit("Stopping all browsers...")
                 self.gpm_service.stop_all_browsers()
-                self.progress.emit(100)
+                self.emit_progress(100)
                 self.result.emit({
                     "success": True,
                     "message": f"Stopped {running} browsers",
@@ -147,7 +146,7 @@ class GPMWorker(Worker):
                 })
             else:
                 # All processes finished naturally
-                self.progress.emit(100)
+                self.emit_progress(100)
                 self.status.emit("All browsers finished")
                 self.result.emit({
                     "success": True,
@@ -170,6 +169,8 @@ class GPMWorker(Worker):
                     pass
         finally:
             self._stop_log_listener()
+            if self.gpm_service:
+                self.gpm_service.release_image_store()
             self.gpm_service = None
             self.status.emit("GPM worker finished")
 
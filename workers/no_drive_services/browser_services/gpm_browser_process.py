@@ -13,7 +13,12 @@ from loguru import logger
 from src.schemas.accounts import AccountEmail
 from src.schemas.manager_image_ai_item_store import ManagerImageAIItemStore
 from src.schemas.task_aI_image_voice_canva_instagram import TaskAIImageVoiceCanvaInstagram
+from workers.no_drive_services.browser_services.shared_image_store import SharedImageStoreSlice
 from workers.no_drive_services.browser_services.task_execute import TaskExecute
+from workers.no_drive_services.web_page_services.gmail.gmail_login import GmailLogin
+from workers.no_drive_services.web_page_services.image_generate.image_generator import ImageGenerator
+from workers.no_drive_services.web_page_services.video_generate.video_generator import VideoGenerator
+from workers.no_drive_services.web_page_services.voice_generate.voice_generator import VoiceGenerator
 
 
 class GPMBrowserProcess:
@@ -43,7 +48,7 @@ class GPMBrowserProcess:
             tasks: List of tasks to launch
             account_email: Account email information for login
             manager_image_ai_item_store: List of manager image AI item store
-            should_stop_flag: Shared multiprocessing flag for stopping (optional)
+            should_stop_flag: Shared multiprocessing.Event for stopping (optional)
         """
         self.profile_name = profile_name
         self.position = position
@@ -52,6 +57,7 @@ class GPMBrowserProcess:
         self.should_stop_flag = should_stop_flag
         self.manager_image_ai_item_store = manager_image_ai_item_store
         self.loop = None
+        self._stop_requested = False  # Local cache, the stop event is never cleared for a running process
 
     @staticmethod
     def run(
@@ -74,7 +80,7 @@ class GPMBrowserProcess:
             tasks: List of tasks to launch
             account_email: Account email information for login
             manager_image_ai_item_store: List of manager image AI item store
-            should_stop_flag: Shared multiprocessing flag for stopping (optional)
+            should_stop_flag: Shared multiprocessing.Event for stopping (optional)
         """
         runner = GPMBrowserProcess(
             profile_name,
@@ -114,15 +120,17 @@ class GPMBrowserProcess:
             # Create the main task
             main_task = self.loop.create_task(self._launch_and_use_browser())
 
-            # Create a monitoring task that checks the stop flag and cancels main task if needed
+            # Create a monitoring task that waits on the stop event and cancels main task if needed
             async def monitor_stop_flag():
-                """Monitor stop flag and cancel main task when flag is set."""
+                """Block on the stop event (off the loop) and cancel main task when it is set."""
+                if self.should_stop_flag is None:
+                    return
                 while not main_task.done():
-                    if self.should_stop_flag and self.should_stop_flag.value:
+                    if await asyncio.to_thread(self.should_stop_flag.wait, 0.5):
+                        self._stop_requested = True
                         logger.info(f"[{self.profile_name}] Stop flag detected, cancelling browser task...")
                         main_task.cancel()
                         break
-                    await asyncio.sleep(0.2)  # Check every 0.2 seconds
 
             monitor_task = self.loop.create_task(monitor_stop_flag())
 
@@ -176,7 +184,7 @@ class GPMBrowserProcess:
         logger.info(f"✅ [{self.profile_name}] Browser launched successfully")
 
         # Check stop flag before navigating
-        if self.should_stop_flag and self.should_stop_flag.value:
+        if self._should_stop():
             logger.info(f"⏹️ [{self.profile_name}] Stop requested before navigation")
             client.close(self.profile_name)
             return False
@@ -187,18 +195,24 @@ class GPMBrowserProcess:
         await UtilActions.goOnTopBrowser(tab=tab)
 
         # Check stop flag before executing tasks
-        if self.should_stop_flag and self.should_stop_flag.value:
+        if self._should_stop():
             logger.info(f"⏹️ [{self.profile_name}] Stop requested before task execution")
             client.close(self.profile_name)
             return False
 
-        # Initialize TaskExecute
-        task_execute = TaskExecute(tab=tab)
+        # Initialize TaskExecute once per process; its page services are shared by every task
+        task_execute = TaskExecute(
+            tab=tab,
+            login_gmail=GmailLogin(),
+            image_generator=ImageGenerator(),
+            voice_generator=VoiceGenerator(),
+            video_generator=VideoGenerator(TaskExecute.FLOW_URL),
+        )
 
         # Execute each task
         for task in self.tasks:
             # Check stop flag before each task
-            if self.should_stop_flag and self.should_stop_flag.value:
+            if self._should_stop():
                 logger.info(f"⏹️ [{self.profile_name}] Stop requested during task execution")
                 break
 
@@ -233,6 +247,12 @@ class GPMBrowserProcess:
         logger.info(f"🔒 [{self.profile_name}] Closing browser...")
         client.close(self.profile_name)
 
+    def _should_stop(self) -> bool:
+        """Check the shared stop event, caching a positive result locally."""
+        if not self._stop_requested and self.should_stop_flag is not None:
+            self._stop_requested = self.should_stop_flag.is_set()
+        return self._stop_requested
+
     async def _refresh_tab(self, browser):
         """
         Reacquire a fresh tab when the current one becomes detached.
@@ -303,7 +323,7 @@ def _run_browser_async(
         position: int,
         tasks: list[TaskAIImageVoiceCanvaInstagram],
         account_email: AccountEmail,
-        manager_image_ai_item_store: list[ManagerImageAIItemStore],
+        manager_image_ai_item_store: list[ManagerImageAIItemStore] | SharedImageStoreSlice,
         should_stop_flag=None,
         log_queue=None,
 ):
@@ -318,8 +338,8 @@ def _run_browser_async(
         position: Position index
         tasks: List of tasks to launch
         account_email: Account email information for login
-        manager_image_ai_item_store: List of manager image AI item store
-        should_stop_flag: Shared multiprocessing flag for stopping (optional)
+        manager_image_ai_item_store: List of manager image AI item store, or a slice of the shared image store
+        should_stop_flag: Shared multiprocessing.Event for stopping (optional)
     """
     if log_queue is not None:
         try:
@@ -345,6 +365,9 @@ def _run_browser_async(
             # If queue setup fails, continue without crashing the browser process
             logger.warning("Failed to attach log queue; continuing without cross-process logs")
 
+    if isinstance(manager_image_ai_item_store, SharedImageStoreSlice):
+        manager_image_ai_item_store = manager_image_ai_item_store.load()
+
     GPMBrowserProcess.run(
         profile_name,
         position,
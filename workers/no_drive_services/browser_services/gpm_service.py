@@ -1,7 +1,8 @@
 """GPM (Google Profile Manager) service for managing multiple browsers using multiprocessing."""
 
 import multiprocessing
-import sys
+import time
+from multiprocessing.connection import wait
 from loguru import logger
 from typing import List, Dict, Optional, Callable
 
@@ -10,15 +11,7 @@ from src.schemas.manager_image_ai_item_store import ManagerImageAIItemStore
 from src.schemas.task_aI_image_voice_canva_instagram import TaskAIImageVoiceCanvaInstagram
 # Import browser process runner (backward compatible function)
 from workers.no_drive_services.browser_services.gpm_browser_process import _run_browser_async
-
-# Set multiprocessing start method for Windows compatibility
-# This must be done before creating any Process objects
-if sys.platform == 'win32':
-    try:
-        multiprocessing.set_start_method('spawn', force=True)
-    except RuntimeError:
-        # Start method already set, which is fine
-        pass
+from workers.no_drive_services.browser_services.shared_image_store import SharedImageStore, SharedImageStoreSlice
 
 
 class GPMService:
@@ -29,11 +22,16 @@ class GPMService:
     each running in its own process for better isolation and performance.
     """
 
+    # Spawn context used for every browser process, so the start method is
+    # local to this service instead of a global set at import time
+    mp_context = multiprocessing.get_context('spawn')
+
     def __init__(self):
         """Initialize the GPM service."""
         self.processes: List[multiprocessing.Process] = []
         self.profile_names: List[str] = []  # Track profile names for closing browsers
-        self._should_stop = multiprocessing.Value('b', False)  # Shared flag for stopping
+        self._should_stop = self.mp_context.Event()  # Shared event for stopping
+        self._image_store = SharedImageStore()  # Image items shared by all browser processes
 
     def launch_multiple_browsers(
             self,
@@ -43,28 +41,36 @@ class GPMService:
     ) -> List[multiprocessing.Process]:
         logger.info(f"🚀 Launching {len(accounts)} browsers in parallel processes...")
 
-        processes = []
+        # Pickle the image items once for all processes, each process only gets its indices
+        image_store_slices = self._image_store.publish(
+            [account.manager_image_ai_item_store for account in accounts]
+        )
+
+        start_index = len(self.processes)
         for i, account in enumerate(accounts):
             profile_name = account.accountAI
-            tasks = list(filter(lambda task: task.accountSocial == account.id, tasks))
+            account_tasks = [task for task in tasks if task.accountSocial == account.id]
             # Create AccountEmail from AccountSocial
             account_email = AccountEmail(
                 email=account.accountAI,
                 password=account.password,
                 code2FA=account.code2FA
             )
-            manager_image_ai_item_store = account.manager_image_ai_item_store
-            logger.info(f'Total tasks of {account_email.email}: {len(tasks)}')
-            process = self.launch_browser_process(
-                profile_name,
-                i,
-                tasks,
-                account_email,
-                manager_image_ai_item_store,
-                log_queue=log_queue,
-            )
-            processes.append(process)
-
+            manager_image_ai_item_store = image_store_slices[i]
+            logger.info(f'Total tasks of {account_email.email}: {len(account_tasks)}')
+            try:
+                self.launch_browser_process(
+                    profile_name,
+                    i,
+                    account_tasks,
+                    account_email,
+                    manager_image_ai_item_store,
+                    log_queue=log_queue,
+                )
+            except Exception as e:
+                logger.error(f"Error launching browser process for {profile_name}: {e}")
+
+        processes = self.processes[start_index:]
         logger.info(f"✅ Started {len(processes)} browser processes")
         return processes
 
@@ -74,14 +80,14 @@ class GPMService:
             position: int,
             tasks: list[TaskAIImageVoiceCanvaInstagram],
             account_email: AccountEmail,
-            manager_image_ai_item_store: list[ManagerImageAIItemStore],
+            manager_image_ai_item_store: list[ManagerImageAIItemStore] | SharedImageStoreSlice,
             should_stop_flag=None,
             log_queue: Optional[object] = None,
     ) -> multiprocessing.Process:
         if should_stop_flag is None:
             should_stop_flag = self._should_stop
 
-        process = multiprocessing.Process(
+        process = self.mp_context.Process(
             target=_run_browser_async,
             args=(
                 profile_name,
@@ -95,6 +101,7 @@ class GPMService:
             daemon=True
         )
         process.start()
+        # Only track the process once it has started so processes/profile_names stay in lockstep
         self.processes.append(process)
         self.profile_names.append(profile_name)  # Track profile name
         return process
@@ -126,35 +133,64 @@ class GPMService:
         except Exception as e:
             logger.error(f"Error closing browsers: {e}")
 
-        # Set stop flag to signal processes to stop
-        self._should_stop.value = True
+        # Set stop event to signal processes to stop
+        self._should_stop.set()
 
-        # Wait for all processes to finish
+        # Wait on all process sentinels at once instead of joining one by one
+        survivors = self._wait_for_exit(self.processes, timeout=5.0)
         for process in self.processes:
-            if process.is_alive():
-                logger.debug(f"Waiting for process {process.pid} to stop gracefully...")
-                process.join(timeout=5.0)  # Wait up to 5 seconds
-                if process.is_alive():
-                    logger.warning(f"Process {process.pid} did not stop gracefully, terminating")
-                    try:
-                        process.terminate()
-                        process.join(timeout=2.0)
-                        if process.is_alive():
-                            logger.warning(f"Process {process.pid} did not respond to terminate, killing")
-                            process.kill()
-                            process.join(timeout=1.0)
-                    except Exception as e:
-                        logger.error(f"Error terminating process {process.pid}: {e}")
-                        try:
-                            process.kill()
-                        except Exception as e2:
-                            logger.error(f"Error killing process {process.pid}: {e2}")
-                else:
-                    logger.debug(f"Process {process.pid} stopped gracefully")
+            if process not in survivors:
+                logger.debug(f"Process {process.pid} stopped gracefully")
+
+        if survivors:
+            for process in survivors:
+                logger.warning(f"Process {process.pid} did not stop gracefully, terminating")
+                try:
+                    process.terminate()
+                except Exception as e:
+                    logger.error(f"Error terminating process {process.pid}: {e}")
+            survivors = self._wait_for_exit(survivors, timeout=2.0)
+
+        if survivors:
+            for process in survivors:
+                logger.warning(f"Process {process.pid} did not respond to terminate, killing")
+                try:
+                    process.kill()
+                except Exception as e:
+                    logger.error(f"Error killing process {process.pid}: {e}")
+            self._wait_for_exit(survivors, timeout=1.0)
 
         self.processes.clear()
         self.profile_names.clear()
-        self._should_stop.value = False
+        self.release_image_store()
+        self._should_stop.clear()
         logger.info("✅ All browser processes stopped")
 
+    def release_image_store(self):
+        """Free the shared image store once no browser process needs it anymore."""
+        self._image_store.release()
 
+    @staticmethod
+    def _wait_for_exit(
+            processes: List[multiprocessing.Process],
+            timeout: float,
+    ) -> List[multiprocessing.Process]:
+        """
+        Block on the sentinels of all processes until they exit or the timeout expires.
+
+        Args:
+            processes: Processes to wait for
+            timeout: Maximum time to wait for all of them (seconds)
+
+        Returns:
+            The processes that are still running after the timeout
+        """
+        pending = {process.sentinel: process for process in processes}
+        deadline = time.monotonic() + timeout
+        while pending:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            for sentinel in wait(list(pending), timeout=remaining):
+                pending.pop(sentinel).join(timeout=0)
+        return list(pending.values())
@@ -0,0 +1,102 @@
+"""Shared-memory publication of manager image AI item stores for browser processes.
+
+Accounts often reference the same image catalog. Instead of pickling every
+account's list into each process' arguments, the union of all items is
+pickled once into a shared memory block and each process only receives
+the indices of its own items.
+"""
+
+import pickle
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Optional
+
+from loguru import logger
+
+from src.schemas.manager_image_ai_item_store import ManagerImageAIItemStore
+
+
+@dataclass(frozen=True)
+class SharedImageStoreSlice:
+    """Lightweight, picklable reference to one account's items in the shared block."""
+
+    shm_name: str
+    size: int
+    indices: tuple[int, ...]
+
+    def load(self) -> list[ManagerImageAIItemStore]:
+        """Attach to the shared block and rebuild this account's item list."""
+        shm = shared_memory.SharedMemory(name=self.shm_name)
+        try:
+            items = pickle.loads(shm.buf[:self.size])
+        finally:
+            shm.close()
+        return [items[i] for i in self.indices]
+
+
+class SharedImageStore:
+    """
+    Owner of the shared memory blocks holding the union of all image store items.
+
+    Created in the parent process. A block must stay alive until every browser
+    process of its launch has loaded its slice, and processes of an earlier
+    launch may still be loading when publish() is called again. So each
+    publish() adds a new block, and release() frees all of them once the
+    processes are stopped or finished.
+    """
+
+    def __init__(self):
+        """Initialize an empty store."""
+        self._blocks: list[shared_memory.SharedMemory] = []
+
+    def publish(
+            self,
+            stores: list[Optional[list[ManagerImageAIItemStore]]],
+    ) -> list[Optional[SharedImageStoreSlice]]:
+        """
+        Publish the union of the given stores and return one slice per store.
+
+        Args:
+            stores: Manager image AI item store of each account (None allowed)
+
+        Returns:
+            A slice per input store, None where the input store was None
+        """
+        items: list[ManagerImageAIItemStore] = []
+        positions: dict[tuple, int] = {}
+        account_indices: list[Optional[tuple[int, ...]]] = []
+        for store in stores:
+            if store is None:
+                account_indices.append(None)
+                continue
+            indices = []
+            for item in store:
+                key = (item.id, item.managerImage, item.typeFolderStore, item.file)
+                if key not in positions:
+                    positions[key] = len(items)
+                    items.append(item)
+                indices.append(positions[key])
+            account_indices.append(tuple(indices))
+
+        payload = pickle.dumps(items, protocol=pickle.HIGHEST_PROTOCOL)
+        shm = shared_memory.SharedMemory(create=True, size=len(payload))
+        shm.buf[:len(payload)] = payload
+        self._blocks.append(shm)
+        logger.debug(f"Published {len(items)} unique image store items ({len(payload)} bytes) to shared memory")
+
+        return [
+            SharedImageStoreSlice(shm.name, len(payload), indices) if indices is not None else None
+            for indices in account_indices
+        ]
+
+    def release(self):
+        """Close and unlink every published shared memory block."""
+        while self._blocks:
+            shm = self._blocks.pop()
+            try:
+                shm.close()
+                shm.unlink()
+            except FileNotFoundError:
+                pass
+            except Exception as e:
+                logger.warning(f"Error releasing shared image store: {e}")
@@ -1,3 +1,6 @@
+import asyncio
+from typing import Optional
+
 import nodriver as nd
 from loguru import logger
 from asyncio import sleep as asyncio_sleep
@@ -7,26 +10,54 @@ from src.schemas.task_aI_image_voice_canva_instagram import TaskAIImageVoiceCanv
 from workers.no_drive_services.web_page_services.gmail.gmail_login import GmailLogin
 from workers.no_drive_services.web_page_services.image_generate.check_in_whisk import CheckInWhisk
 from workers.no_drive_services.web_page_services.image_generate.image_generator import ImageGenerator
+from workers.no_drive_services.web_page_services.page_script import evaluate_value
 from workers.no_drive_services.web_page_services.voice_generate.check_in_speech import CheckInSpeech
 from workers.no_drive_services.web_page_services.voice_generate.voice_generator import VoiceGenerator
 from workers.no_drive_services.web_page_services.video_generate.video_generator import VideoGenerator
 
 
 class TaskExecute:
-    def __init__(self, tab: nd.Tab):
+    WHISK_URL = "https://labs.google/fx/tools/whisk"
+    SPEECH_URL = "https://aistudio.google.com/generate-speech"
+    FLOW_URL = "https://labs.google/fx/tools/flow"
+    PAGE_LOAD_TIMEOUT = 10  # seconds
+    PAGE_LOAD_POLL_INTERVAL = 0.1  # seconds
+
+    def __init__(
+            self,
+            tab: nd.Tab,
+            login_gmail: Optional[GmailLogin] = None,
+            image_generator: Optional[ImageGenerator] = None,
+            voice_generator: Optional[VoiceGenerator] = None,
+            video_generator: Optional[VideoGenerator] = None,
+    ):
+        """
+        Initialize the task executor.
+
+        The page services are meant to be created once per browser process and
+        shared across every task of that account; pass them in to reuse them,
+        otherwise fresh instances are created.
+
+        Args:
+            tab: Browser tab
+            login_gmail: Shared Gmail login handler (optional)
+            image_generator: Shared image generator (optional)
+            voice_generator: Shared voice generator (optional)
+            video_generator: Shared video generator (optional)
+        """
         self.account_email = None
         self.task = None
         self.images_ai = None
 
-        self.whisk_url = "https://labs.google/fx/tools/whisk"
-        self.speech_url = "https://aistudio.google.com/generate-speech"
-        self.flow_url = "https://labs.google/fx/tools/flow"
+        self.whisk_url = self.WHISK_URL
+        self.speech_url = self.SPEECH_URL
+        self.flow_url = self.FLOW_URL
         self.tab = tab
 
-        self.login_gmail = GmailLogin()
-        self.image_generator = ImageGenerator()
-        self.voice_generator = VoiceGenerator()
-        self.video_generator = VideoGenerator(self.flow_url)
+        self.login_gmail = login_gmail or GmailLogin()
+        self.image_generator = image_generator or ImageGenerator()
+        self.voice_generator = voice_generator or VoiceGenerator()
+        self.video_generator = video_generator or VideoGenerator(self.flow_url)
 
     async def execute_work_flow(
             self,
@@ -38,6 +69,11 @@ class TaskExecute:
         self.task = task
         self.images_ai = manager_image_ai_item_store
 
+        # Generators are shared across tasks, drop state left by the previous one
+        self.image_generator.reset()
+        self.voice_generator.reset()
+        self.video_generator.reset()
+
         # Step 1: Generate Image in Whisk
         await self._whisk_generate()
 
@@ -80,9 +116,12 @@ class TaskExecute:
             self.account_email,
             self.task,
         )
+
     async def _flow_generate(self):
         await self.tab.get(self.flow_url)
-        await asyncio_sleep(5)
+        # Flow either lands on the tool or redirects to Google sign-in; both
+        # steps below probe their own elements, they only need a loaded document
+        await self._wait_document_loaded()
 
         logger.info("Check login gmail if needed...")
         await self._login_gmail(False)
@@ -94,6 +133,19 @@ class TaskExecute:
             self.task,
         )
 
+    async def _wait_document_loaded(self):
+        """Wait until the current document finished loading, capped at PAGE_LOAD_TIMEOUT."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.PAGE_LOAD_TIMEOUT
+        while loop.time() < deadline:
+            try:
+                if await evaluate_value(self.tab, "document.readyState") == "complete":
+                    return
+            except Exception as e:
+                logger.debug(f"Document state probe failed: {e}")
+            await asyncio_sleep(self.PAGE_LOAD_POLL_INTERVAL)
+        logger.debug(f"Document still loading after {self.PAGE_LOAD_TIMEOUT}s, continuing")
+
     async def _login_gmail(self, click_success):
         if click_success:
             logger.info("✅ Successfully entered tool - no Gmail login needed")
@@ -1,11 +1,99 @@
+import asyncio
+import json
+import time
+from contextlib import suppress
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Mapping, Optional, Sequence
+
 import nodriver as nd
 from src.schemas.accounts import AccountEmail
 from loguru import logger
 
+from workers.no_drive_services.web_page_services.page_script import evaluate_value
+
+# Resolved once per process by _load_utils(); importing nodrive_gpm_package at
+# module import time causes multiprocessing import issues on Windows
+UtilActions = None
+UtilDecode = None
+
+
+def _load_utils():
+    """Import the nodrive_gpm_package helpers once, inside the worker process."""
+    global UtilActions, UtilDecode
+    if UtilActions is None:
+        from nodrive_gpm_package.utils import UtilActions as _UtilActions, UtilDecode as _UtilDecode
+        UtilActions, UtilDecode = _UtilActions, _UtilDecode
+
+
+@lru_cache(maxsize=1024)
+def _cached_totp(seed: str, window: int) -> str:
+    """
+    Decode a TOTP seed once per 30s window, shared by every login in the process.
+
+    Args:
+        seed: 2FA secret of the account
+        window: TOTP window index (unix time // 30), only used as part of the cache key
+
+    Returns:
+        The current one-time code
+    """
+    _load_utils()
+    return UtilDecode.code2Fa(seed)
+
 
 class GmailLogin:
+    # Email input field, all known variants OR-joined so one query finds it
+    EMAIL_INPUT_SELECTOR = 'input[type="email"], input#identifierId, input[name="identifier"]'
+
+    # Next button strategies, supports both English and Vietnamese
+    # Based on HTML: button with id="identifierNext" contains span with text "Tiếp theo" (Vietnamese) or "Next" (English)
+    NEXT_BUTTON_STRATEGIES = tuple(MappingProxyType(strategy) for strategy in (
+        {"rootTag": "button", "attributes": {"id": "identifierNext"}},
+        {"rootTag": "button", "attributes": {"jsname": "LgbsSe"}},
+    ))
+
+    # Text fallback for the Next button, matched in one evaluate call over all candidates
+    NEXT_BUTTON_TEXT_PATTERN = "/^(Next|Tiếp theo)$/"
+    NEXT_BUTTON_TEXT_SELECTOR = "button"
+    # The email step additionally accepts div[role="button"] Next buttons
+    EMAIL_NEXT_BUTTON_TEXT_SELECTOR = 'button, div[role="button"]'
+
+    # 2FA input field, all known variants OR-joined so one query finds it
+    # Based on HTML: input with id="totpPin", name="totpPin", type="tel", aria-label="Nhập mã" (Vietnamese) or "Enter code" (English)
+    CODE2FA_INPUT_SELECTOR = (
+        'input#totpPin, input[name="totpPin"], input[aria-label="Nhập mã"], '
+        'input[aria-label="Enter code"], input[type="tel"]'
+    )
+
+    # Wrong 2FA code / password messages: English, Vietnamese variations
+    WRONG_CODE_MESSAGES = ("Wrong code", "Mã không đúng", "Sai mã")
+    WRONG_PASSWORD_MESSAGES = ("Wrong password", "Sai mật khẩu")
+
+    # JS regex literals matched against the page text in a single evaluate call
+    WRONG_CODE_PATTERN = "/" + "|".join(WRONG_CODE_MESSAGES) + "/"
+    WRONG_PASSWORD_PATTERN = "/" + "|".join(WRONG_PASSWORD_MESSAGES) + "/"
+    WRONG_TEXT_PROBE_TIMEOUT = 2
+    # Gmail shows the wrong password message only after its server verdict, so
+    # this wait follows the page response and is not scaled from the CDP RTT
+    WRONG_PASSWORD_TIMEOUT = 7
+    CLICK_PROBE_TIMEOUT = 5
+
+    # Probe timeouts scaled from the measured CDP round-trip time, with floors
+    CLICK_PROBE_RTT_FACTOR = 20
+    CLICK_PROBE_MIN = 1.0
+    TEXT_PROBE_RTT_FACTOR = 40
+    TEXT_PROBE_MIN = 2.0
+
+    # TOTP time step and minimum remaining validity before submitting a code (seconds)
+    TOTP_PERIOD = 30
+    TOTP_MIN_SECONDS_LEFT = 5
+
     def __init__(self):
-        pass
+        _load_utils()
+        # Uncalibrated defaults, replaced by _calibrate_timeouts() once a tab is available
+        self.click_probe_timeout: float = self.CLICK_PROBE_TIMEOUT
+        self.text_probe_timeout: float = self.WRONG_TEXT_PROBE_TIMEOUT
 
     async def execute_gmail_login(
             self,
@@ -27,29 +115,48 @@ class GmailLogin:
         if not account_email.email or not account_email.password:
             raise ValueError("Email and password are required")
 
-        try:
-            is_login = await self._change_param_name(tab=tab)
-            if is_login:
-                return 
+        await self._calibrate_timeouts(tab=tab)
 
-            # Check if account is already available on the page
-            account_clicked = await self._check_and_click_existing_account(tab=tab, account_email=account_email)
+        try:
+            # Race the mutually exclusive page states instead of probing them one after another
+            page_state, element = await self._detect_login_page(tab=tab, account_email=account_email)
+            if page_state is None:
+                logger.info("No login form found, account is likely already logged in")
+                return
 
-            # Only input email if account wasn't found/clicked
-            if not account_clicked:
-                # Input email
-                if not await self._input_email(tab=tab, account_email=account_email):
-                    raise Exception("Failed to input email")
+            if page_state == "account_tile":
+                # Account is already available on the "Choose an account" page
+                await UtilActions.clickOnElement(tab=tab, elm=element)
+                logger.info(f"Found and clicked existing account: {account_email.email}")
+            elif not await self._input_email(
+                    tab=tab,
+                    account_email=account_email,
+                    email_input=element if element.tag_name == "input" else None,
+            ):
+                raise Exception("Failed to input email")
 
             # Input password (required regardless of whether account was clicked or email was entered)
             if not await self._input_password(tab=tab, account_email=account_email):
                 raise Exception("Failed to input password - password may be incorrect")
 
-            # Check if 2FA is required (this may enter 2FA code if detected)
-            await self._check_2fa(tab=tab, account_email=account_email)
+            # Check if 2FA is required, the code is already entered when it was detected
+            if await self._check_2fa(tab=tab, account_email=account_email):
+                return
 
-            await self._try_another_way(tab=tab)
-            await self._google_authenticator(tab=tab)
+            # Race the TOTP field against the "Try another way" detour, Gmail often skips the latter
+            totp_ready = asyncio.create_task(tab.select(self.CODE2FA_INPUT_SELECTOR, timeout=15))
+            try_another = asyncio.create_task(self._try_another_way(tab=tab))
+            try:
+                done, _ = await asyncio.wait(
+                    {totp_ready, try_another},
+                    return_when=asyncio.FIRST_COMPLETED,
+                    timeout=15,
+                )
+                if try_another in done and try_another.result():
+                    await self._google_authenticator(tab=tab)
+            finally:
+                totp_ready.cancel()
+                try_another.cancel()
 
             # Enter 2FA code
             logger.info("Entering 2FA code...")
@@ -57,244 +164,435 @@ class GmailLogin:
         except Exception as e:
             logger.error('Error while login with gmail, keep continue')
 
-    async def _change_param_name(self, tab: nd.Tab):
+    async def _calibrate_timeouts(self, tab: nd.Tab):
         """
-        Wait for the Gmail login page to load by checking for the 'Forgot email?' button.
-        
-        This method waits for the page to be ready before proceeding with login.
+        Scale the click and page text probe timeouts from one CDP ping.
+
+        Only probes for elements that are expected to be on the current page
+        use these; waits for a new page to load keep their fixed timeouts.
+
+        Args:
+            tab: Browser tab
         """
-        # Import here to avoid multiprocessing import issues on Windows
-        from nodrive_gpm_package.utils import UtilActions
+        loop = asyncio.get_running_loop()
+        started = loop.time()
         try:
-            await UtilActions.getElement(
-                tab=tab,  # Changed parameter name only
-                rootTag="button",
-                text="Forgot email?",
-                timeout=10,
-            )
-            logger.info("Page loaded successfully")
-            return False
-        except IndexError as e:
-            # Element not found - page might not be loaded or element doesn't exist
-            logger.warning(f"Could not find 'Forgot email?' button - page may not be fully loaded: {e}")
-            # Continue anyway - the page might still be usable
-            return True
+            await tab.evaluate("1")
         except Exception as e:
-            logger.warning(f"Unexpected error waiting for page load: {e}")
-            # Continue anyway - don't block the login flow
-            return True
+            logger.debug(f"CDP ping failed, keeping default probe timeouts: {e}")
+            return
+        rtt = loop.time() - started
+        self.click_probe_timeout = max(rtt * self.CLICK_PROBE_RTT_FACTOR, self.CLICK_PROBE_MIN)
+        self.text_probe_timeout = max(rtt * self.TEXT_PROBE_RTT_FACTOR, self.TEXT_PROBE_MIN)
+        logger.debug(f"CDP RTT {rtt * 1000:.1f}ms, click probe {self.click_probe_timeout:.1f}s, text probe {self.text_probe_timeout:.1f}s")
 
-    async def _check_and_click_existing_account(
+    async def _detect_login_page(
             self,
             tab: nd.Tab,
-            account_email: AccountEmail
-    ):
+            account_email: AccountEmail,
+            timeout: float = 10,
+    ) -> tuple[Optional[str], Optional[nd.Element]]:
         """
-        Check if the account is already available on the "Choose an account" page and click it.
-        
+        Probe the possible login page states concurrently and return the first one found.
+
         Args:
             tab: Browser tab
             account_email: Account email information
-            
+            timeout: Timeout applied to every probe
+
         Returns:
-            True if account was found and clicked, False otherwise
+            ("account_tile", element) when the account is listed on the "Choose an account" page,
+            ("email_input", element) when the email step is shown,
+            (None, None) when no login form appeared before the timeout
         """
-        logger.info(f"Checking if account {account_email.email} is already available...")
-        
-        # Import here to avoid multiprocessing import issues on Windows
-        from nodrive_gpm_package.utils import UtilActions
-        try:
-            # Try to find the account by clicking on the parent div with role="link"
-            # The email text is in a nested div, so we find the inner div by text and click its parent
-            await UtilActions.click(
+        logger.info(f"Detecting login page state for {account_email.email}...")
+        # Dict order is the dispatch priority when several probes finish together
+        probes = {
+            "account_tile": asyncio.create_task(UtilActions.getElement(
                 tab=tab,
                 parentTag="div",
-                parentAttributes={
-                    "role": "link"
-                },
+                parentAttributes={"role": "link"},
                 rootTag="div",
                 text=account_email.email,
-                timeout=5,
-            )
-            logger.info(f"Found and clicked existing account: {account_email.email}")
-            return True
-        except (IndexError, Exception) as e:
-            # Account not found on the page - this is normal if it's a fresh login
-            logger.debug(f"Account not found on page (will proceed with email input): {e}")
-            return False
+                timeout=timeout,
+            )),
+            "email_input": asyncio.create_task(UtilActions.getElement(
+                tab=tab,
+                rootTag="input",
+                attributes={"type": "email"},
+                timeout=timeout,
+            )),
+            "page_loaded": asyncio.create_task(UtilActions.getElement(
+                tab=tab,
+                rootTag="button",
+                text="Forgot email?",
+                timeout=timeout,
+            )),
+        }
+        pending = set(probes.values())
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for state, probe in probes.items():
+                    if probe not in done or probe.cancelled() or probe.exception() is not None:
+                        continue
+                    element = probe.result()
+                    if element:
+                        logger.info(f"Login page state: {state}")
+                        # "Forgot email?" only proves the email step is loaded
+                        return ("email_input" if state == "page_loaded" else state), element
+            return None, None
+        finally:
+            for probe in probes.values():
+                probe.cancel()
 
     async def _input_email(
             self,
             tab: nd.Tab,
-            account_email: AccountEmail
+            account_email: AccountEmail,
+            email_input: Optional[nd.Element] = None,
     ):
-        # Import here to avoid multiprocessing import issues on Windows
-        from nodrive_gpm_package.utils import UtilActions
-        import asyncio
-        
-        # Wait for email input field to be available
-        logger.info("Waiting for email input field to be available...")
-        max_wait_attempts = 5
-        for attempt in range(max_wait_attempts):
+        """
+        Type the email and click Next.
+
+        Args:
+            tab: Browser tab
+            account_email: Account email information
+            email_input: Email input element already found by the caller, looked up if None
+
+        Returns:
+            True if the email was submitted, False otherwise
+        """
+        if email_input is None:
+            # Wait for email input field and keep its handle for typing
+            logger.info("Waiting for email input field to be available...")
             try:
-                await UtilActions.getElement(
-                    tab=tab,
-                    rootTag="input",
-                    attributes={"type": "email"},
-                    timeout=3,
-                )
-                logger.info("Email input field found")
-                break
+                email_input = await tab.select(self.EMAIL_INPUT_SELECTOR, timeout=15)
             except Exception as e:
-                if attempt < max_wait_attempts - 1:
-                    logger.debug(f"Email input field not found yet (attempt {attempt + 1}/{max_wait_attempts}), waiting...")
-                    await asyncio.sleep(1)
-                else:
-                    logger.warning(f"Email input field not found after {max_wait_attempts} attempts, proceeding anyway...")
-        
-        # Try multiple strategies to input email
-        strategies = [
-            # Strategy 1: Standard email input
-            {
-                "name": "standard email input",
-                "sendKey": {
-                    "rootTag": "input",
-                    "attributes": {"type": "email"},
-                    "contentInput": account_email.email,
-                    "typeSendKey": "human",
-                    "timeDelayAction": 1,
-                    "timeout": 10,
-                }
-            },
-            # Strategy 2: Try with id attribute
-            {
-                "name": "email input by id",
-                "sendKey": {
-                    "rootTag": "input",
-                    "attributes": {"id": "identifierId"},
-                    "contentInput": account_email.email,
-                    "typeSendKey": "human",
-                    "timeDelayAction": 1,
-                    "timeout": 10,
-                }
-            },
-            # Strategy 3: Try with name attribute
-            {
-                "name": "email input by name",
-                "sendKey": {
-                    "rootTag": "input",
-                    "attributes": {"name": "identifier"},
-                    "contentInput": account_email.email,
-                    "typeSendKey": "human",
-                    "timeDelayAction": 1,
-                    "timeout": 10,
-                }
-            },
-        ]
-        
-        for strategy in strategies:
+                logger.warning(f"Email input field not found after 15s: {e}")
+
+        if email_input:
             try:
-                logger.info(f"Trying {strategy['name']}...")
-                await UtilActions.sendKey(
-                    tab=tab,
-                    **strategy["sendKey"]
-                )
-                
-                # Wait a bit for the input to be processed
-                await asyncio.sleep(1)
-                
-                # Try to click Next button with multiple strategies
-                # Based on HTML: button with id="identifierNext" contains span with text "Tiếp theo" (Vietnamese) or "Next" (English)
-                next_clicked = False
-                next_strategies = [
-                    # Strategy 1: Use button ID (most reliable)
-                    {
-                        "rootTag": "button",
-                        "attributes": {"id": "identifierNext"},
-                        "timeout": 5,
-                    },
-                    # Strategy 2: Use jsname attribute
-                    {
-                        "rootTag": "button",
-                        "attributes": {"jsname": "LgbsSe"},
-                        "timeout": 5,
-                    },
-                    # Strategy 3: Button with span containing "Next" (English)
-                    {
-                        "parentTag": "button",
-                        "rootTag": "span",
-                        "text": "Next",
-                        "timeout": 5,
-                    },
-                    # Strategy 4: Button with span containing "Tiếp theo" (Vietnamese)
-                    {
-                        "parentTag": "button",
-                        "rootTag": "span",
-                        "text": "Tiếp theo",
-                        "timeout": 5,
-                    },
-                    # Strategy 5: Direct button with "Next" text
-                    {
-                        "rootTag": "button",
-                        "text": "Next",
-                        "timeout": 5,
-                    },
-                    # Strategy 6: Direct button with "Tiếp theo" text
-                    {
-                        "rootTag": "button",
-                        "text": "Tiếp theo",
-                        "timeout": 5,
-                    },
-                    # Strategy 7: Div with role="button" containing "Next"
-                    {
-                        "rootTag": "div",
-                        "attributes": {"role": "button"},
-                        "text": "Next",
-                        "timeout": 5,
-                    },
-                    # Strategy 8: Div with role="button" containing "Tiếp theo"
-                    {
-                        "rootTag": "div",
-                        "attributes": {"role": "button"},
-                        "text": "Tiếp theo",
-                        "timeout": 5,
-                    },
-                ]
-                
-                for next_strategy in next_strategies:
-                    try:
-                        await UtilActions.click(tab=tab, **next_strategy)
-                        next_clicked = True
-                        logger.info(f"✅ Successfully clicked Next button using {strategy['name']}")
-                        break
-                    except Exception as e:
-                        logger.debug(f"Next button click strategy failed: {e}")
-                        continue
-                
-                if next_clicked:
+                await self._insert_text(tab=tab, element=email_input, text=account_email.email)
+
+                # Try to click Next button with multiple strategies (supports both English and Vietnamese)
+                if await self._click_next(tab=tab, text_selector=self.EMAIL_NEXT_BUTTON_TEXT_SELECTOR):
+                    logger.info("✅ Successfully clicked Next button after email input")
                     return True
-                else:
-                    logger.warning(f"Email input succeeded but Next button not found for {strategy['name']}")
-                    
+                logger.warning("Email input succeeded but Next button not found")
             except Exception as e:
-                logger.debug(f"Strategy {strategy['name']} failed: {e}")
-                continue
-        
-        # If all strategies failed, try the fallback method
-        logger.warning("All email input strategies failed, trying fallback method...")
+                logger.debug(f"Email input failed: {e}")
+
+        # Email input failed, try the fallback method
+        logger.warning("Email input failed, trying fallback method...")
         try:
             return await self._try_input_email_again(tab=tab, account_email=account_email)
         except Exception as e:
             logger.error(f"Fallback method also failed: {e}")
             return False
 
+    async def _insert_text(
+            self,
+            tab: nd.Tab,
+            element: nd.Element,
+            text: str,
+    ):
+        """
+        Replace the value of an input with one CDP Input.insertText call instead of per-key events.
+
+        Args:
+            tab: Browser tab
+            element: Input element to fill
+            text: Text to insert
+        """
+        await element.clear_input()
+        await element.focus()
+        await tab.send(nd.cdp.input_.insert_text(text=text))
+
+    async def _click_next(
+            self,
+            tab: nd.Tab,
+            text_selector: str = NEXT_BUTTON_TEXT_SELECTOR,
+    ) -> bool:
+        """
+        Click the Next button, by attributes first and by its English/Vietnamese text as a fallback.
+
+        Args:
+            tab: Browser tab
+            text_selector: CSS selector of the candidates for the text fallback
+
+        Returns:
+            True if a Next button was clicked, False otherwise
+        """
+        if await self._click_first_available(tab=tab, strategies=self.NEXT_BUTTON_STRATEGIES):
+            return True
+        return await self._click_page_text(tab=tab, pattern=self.NEXT_BUTTON_TEXT_PATTERN, selector=text_selector)
+
+    async def _click_page_text(
+            self,
+            tab: nd.Tab,
+            pattern: str,
+            selector: str,
+    ) -> bool:
+        """
+        Click the first visible element whose text matches a regex, in a single evaluate call.
+
+        Args:
+            tab: Browser tab
+            pattern: JS regex literal, e.g. "/^(Next|Tiếp theo)$/"
+            selector: CSS selector of the candidate elements
+
+        Returns:
+            True if a matching element was clicked, False otherwise
+        """
+        expression = f"""
+            (() => {{
+                const pattern = {pattern};
+                for (const el of document.querySelectorAll({json.dumps(selector)})) {{
+                    if (el.offsetParent !== null && pattern.test(el.innerText.trim())) {{
+                        el.scrollIntoView({{block: 'center'}});
+                        el.click();
+                        return true;
+                    }}
+                }}
+                return false;
+            }})()
+        """
+        try:
+            return await evaluate_value(tab, expression) is True
+        except Exception as e:
+            logger.debug(f"Text click probe failed: {e}")
+            return False
+
+    async def _click_first_available(
+            self,
+            tab: nd.Tab,
+            strategies: Sequence[Mapping],
+            timeout: Optional[float] = None,
+    ) -> bool:
+        """
+        Probe all click strategies concurrently and click the element of the highest-priority hit.
+
+        Probes run in parallel, but they are awaited in priority order. A lower
+        priority element is only clicked once every strategy before it has
+        come up empty.
+
+        Args:
+            tab: Browser tab
+            strategies: UtilActions locator kwargs, one dict per strategy
+            timeout: Timeout applied to every probe, defaults to click_probe_timeout
+
+        Returns:
+            True if an element was found and clicked, False otherwise
+        """
+        if timeout is None:
+            timeout = self.click_probe_timeout
+        probes = [
+            asyncio.create_task(UtilActions.getElement(tab=tab, **{**strategy, "timeout": timeout}))
+            for strategy in strategies
+        ]
+        try:
+            for probe in probes:
+                try:
+                    element = await probe
+                except Exception as e:
+                    logger.debug("Click strategy probe failed: {}", e)
+                    continue
+                if element:
+                    await UtilActions.clickOnElement(tab=tab, elm=element)
+                    return True
+            return False
+        finally:
+            for probe in probes:
+                probe.cancel()
+
+    async def _wait_ready(
+            self,
+            tab: nd.Tab,
+            probe_strategy: dict,
+            max_ms: int = 2000,
+            poll_ms: int = 100,
+    ) -> bool:
+        """
+        Wait until the probed element is present, instead of sleeping a fixed time.
+
+        Args:
+            tab: Browser tab
+            probe_strategy: UtilActions locator kwargs of the element signalling readiness
+            max_ms: Maximum time to wait (milliseconds)
+            poll_ms: Interval between probes (milliseconds)
+
+        Returns:
+            True as soon as the element is found, False once max_ms has elapsed
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_ms / 1000
+        while True:
+            with suppress(Exception):
+                await UtilActions.getElement(tab=tab, **probe_strategy, timeout=poll_ms / 1000)
+                return True
+            if loop.time() >= deadline:
+                return False
+            await asyncio.sleep(poll_ms / 1000)
+
+    async def _match_page_text(self, tab: nd.Tab, pattern: str) -> Optional[str]:
+        """
+        Match a regex against the page text once.
+
+        Args:
+            tab: Browser tab
+            pattern: JS regex literal, e.g. "/Wrong code|Sai mã/"
+
+        Returns:
+            The matched text, or None if the page text does not match
+
+        Raises:
+            RuntimeError: If the page script failed
+        """
+        expression = f"""
+            (() => {{
+                const match = (document.body ? document.body.innerText : '').match({pattern});
+                return match ? match[0] : null;
+            }})()
+        """
+        matched = await evaluate_value(tab, expression)
+        return matched if isinstance(matched, str) and matched else None
+
+    async def _find_page_text(
+            self,
+            tab: nd.Tab,
+            pattern: str,
+            timeout: Optional[float] = None,
+            interval: float = 0.3,
+    ) -> Optional[str]:
+        """
+        Match a regex against the page text with one evaluate call per try.
+
+        Args:
+            tab: Browser tab
+            pattern: JS regex literal, e.g. "/Wrong code|Sai mã/"
+            timeout: Maximum time to keep retrying (seconds), defaults to text_probe_timeout
+            interval: Delay between tries (seconds)
+
+        Returns:
+            The matched text, or None if nothing matched before the timeout
+        """
+        if timeout is None:
+            timeout = self.text_probe_timeout
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            try:
+                matched = await self._match_page_text(tab=tab, pattern=pattern)
+                if matched:
+                    return matched
+            except Exception as e:
+                logger.debug("Page text probe failed: {}", e)
+            if loop.time() >= deadline:
+                return None
+            await asyncio.sleep(interval)
+
+    async def _submit_code_2FA(
+            self,
+            tab: nd.Tab,
+            timeout: float = 10,
+    ) -> Optional[str]:
+        """
+        Click Next after the 2FA code and wait for Gmail's verdict.
+
+        A navigation of the main frame means the code was accepted, so the
+        wrong-code text probe is raced against the CDP navigation events
+        instead of always polling the page text to completion.
+
+        Args:
+            tab: Browser tab
+            timeout: Maximum time to wait for either signal (seconds)
+
+        Returns:
+            The wrong-code message if one appeared, None if the code was accepted
+
+        Raises:
+            Exception: If the Next button could not be clicked
+        """
+        navigated = asyncio.Event()
+
+        def on_navigated(event):
+            if isinstance(event, nd.cdp.page.FrameNavigated) and event.frame.parent_id is not None:
+                return  # Sub-frame navigation, not the login form
+            navigated.set()
+
+        # A message left from a previous wrong code must not be read as the new verdict
+        try:
+            stale_message = await self._match_page_text(tab=tab, pattern=self.WRONG_CODE_PATTERN)
+        except Exception as e:
+            logger.debug(f"Wrong code pre-check failed: {e}")
+            stale_message = None
+
+        navigation_events = (nd.cdp.page.FrameNavigated, nd.cdp.page.NavigatedWithinDocument)
+        for event_type in navigation_events:
+            tab.add_handler(event_type, on_navigated)
+        try:
+            # Try multiple strategies to click Next button (supports both English and Vietnamese)
+            if not await self._click_next(tab=tab):
+                raise Exception("Could not click Next button after 2FA code")
+            logger.info("✅ Successfully clicked Next button after 2FA code")
+
+            logger.info("Checking if 2FA code was accepted...")
+            navigation = asyncio.create_task(navigated.wait())
+            wrong_code = asyncio.create_task(
+                self._wait_wrong_code(tab=tab, timeout=timeout, stale=stale_message is not None)
+            )
+            try:
+                done, _ = await asyncio.wait(
+                    {navigation, wrong_code},
+                    return_when=asyncio.FIRST_COMPLETED,
+                    timeout=timeout,
+                )
+            finally:
+                navigation.cancel()
+                wrong_code.cancel()
+
+            if navigation in done:
+                logger.debug("Page navigated after 2FA submit")
+                return None
+            # Wrong code message in both English and Vietnamese, None if the probe timed out
+            return wrong_code.result() if wrong_code in done else None
+        finally:
+            for event_type in navigation_events:
+                tab.remove_handler(event_type, on_navigated)
+
+    async def _wait_wrong_code(self, tab: nd.Tab, timeout: float, stale: bool) -> Optional[str]:
+        """
+        Wait for the wrong-code message of the code just submitted.
+
+        Args:
+            tab: Browser tab
+            timeout: Maximum time to wait (seconds)
+            stale: Whether the message of a previous attempt was still shown at submit time
+
+        Returns:
+            The wrong-code message, or None if none appeared before the timeout
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        if stale:
+            # Gmail clears the old message while it checks the new code
+            while loop.time() < deadline:
+                with suppress(Exception):
+                    if not await self._match_page_text(tab=tab, pattern=self.WRONG_CODE_PATTERN):
+                        break
+                await asyncio.sleep(0.1)
+        return await self._find_page_text(
+            tab=tab,
+            pattern=self.WRONG_CODE_PATTERN,
+            timeout=max(deadline - loop.time(), 0),
+        )
+
     async def _try_input_email_again(
             self,
             tab: nd.Tab,
             account_email: AccountEmail
     ):
-        # Import here to avoid multiprocessing import issues on Windows
-        from nodrive_gpm_package.utils import UtilActions
         try:
             logger.info("Try input email again...")
             await UtilActions.click(
@@ -315,27 +613,12 @@ class GmailLogin:
                 },
                 contentInput=account_email.email,
                 typeSendKey="human",
-                timeDelayAction=2,
+                timeDelayAction=0.2,
             )
             # Try multiple strategies to click Next button (supports both English and Vietnamese)
-            next_strategies = [
-                {"rootTag": "button", "attributes": {"id": "identifierNext"}, "timeout": 5},
-                {"rootTag": "button", "attributes": {"jsname": "LgbsSe"}, "timeout": 5},
-                {"parentTag": "button", "rootTag": "span", "text": "Next", "timeout": 5},
-                {"parentTag": "button", "rootTag": "span", "text": "Tiếp theo", "timeout": 5},
-                {"rootTag": "button", "text": "Next", "timeout": 5},
-                {"rootTag": "button", "text": "Tiếp theo", "timeout": 5},
-            ]
-            next_clicked = False
-            for next_strategy in next_strategies:
-                try:
-                    await UtilActions.click(tab=tab, **next_strategy)
-                    next_clicked = True
-                    logger.info("✅ Successfully clicked Next button in fallback method")
-                    break
-                except Exception as e:
-                    logger.debug(f"Next button click strategy failed in fallback: {e}")
-                    continue
+            next_clicked = await self._click_next(tab=tab)
+            if next_clicked:
+                logger.info("✅ Successfully clicked Next button in fallback method")
             
             if not next_clicked:
                 raise Exception("Could not click Next button in fallback method")
@@ -349,8 +632,6 @@ class GmailLogin:
             tab: nd.Tab,
             account_email: AccountEmail
     ):
-        # Import here to avoid multiprocessing import issues on Windows
-        from nodrive_gpm_package.utils import UtilActions
         try:
             logger.info("Input password...")
             await UtilActions.sendKey(
@@ -363,47 +644,25 @@ class GmailLogin:
                 typeSendKey="human",
             )
             # Try multiple strategies to click Next button (supports both English and Vietnamese)
-            next_strategies = [
-                {"rootTag": "button", "attributes": {"id": "identifierNext"}, "timeout": 5},
-                {"rootTag": "button", "attributes": {"jsname": "LgbsSe"}, "timeout": 5},
-                {"parentTag": "button", "rootTag": "span", "text": "Next", "timeout": 5},
-                {"parentTag": "button", "rootTag": "span", "text": "Tiếp theo", "timeout": 5},
-                {"rootTag": "button", "text": "Next", "timeout": 5},
-                {"rootTag": "button", "text": "Tiếp theo", "timeout": 5},
-            ]
-            next_clicked = False
-            for next_strategy in next_strategies:
-                try:
-                    await UtilActions.click(tab=tab, **next_strategy)
-                    next_clicked = True
-                    logger.info("✅ Successfully clicked Next button after password input")
-                    break
-                except Exception as e:
-                    logger.debug(f"Next button click strategy failed after password: {e}")
-                    continue
+            next_clicked = await self._click_next(tab=tab)
+            if next_clicked:
+                logger.info("✅ Successfully clicked Next button after password input")
             
             if not next_clicked:
                 raise Exception("Could not click Next button after password input")
 
-            isWrongPass = False
-            try:
-                logger.info("Check password is correct???")
-                await UtilActions.getElement(
-                    tab=tab,  # Keep parameter name as driver to match UtilActions
-                    text="Wrong password",
-                    timeout=7,
-                )
-                isWrongPass = True
-            except (IndexError, Exception) as e:
-                # Element not found means password was correct
-                # IndexError can occur if UtilActions.getElement can't find the element
-                logger.debug(f"Password check element not found (password likely correct): {e}")
-                return True
-
-            if isWrongPass:
+            logger.info("Check password is correct???")
+            wrong_pass_text = await self._find_page_text(
+                tab=tab,
+                pattern=self.WRONG_PASSWORD_PATTERN,
+                timeout=self.WRONG_PASSWORD_TIMEOUT,
+            )
+            if wrong_pass_text:
                 # TODO: Update status Wrong Password to Database
                 logger.error("Password incorrect, please try again")
                 return False
+            # Message not found means password was correct
+            logger.debug("Wrong password message not found (password likely correct)")
         except Exception as e:
             logger.error(f"Error input password: {e}")
             return False
@@ -413,8 +672,6 @@ class GmailLogin:
             self,
             tab: nd.Tab,
     ):
-        # Import here to avoid multiprocessing import issues on Windows
-        from nodrive_gpm_package.utils import UtilActions
         try:
             logger.info("Try another way...")
             await UtilActions.click(
@@ -422,9 +679,10 @@ class GmailLogin:
                 rootTag="span",
                 text="Try another way",
                 timeout=5,
-                timeDelayAction=2,
+                timeDelayAction=0.2,
                 scrollToElement="vertical",
             )
+            await self._wait_ready(tab=tab, probe_strategy={"parentTag": "div", "rootTag": "strong", "text": "Google Authenticator"})
         except Exception as e:
             logger.error(f"Error try another way: {e}")
             return False
@@ -434,8 +692,6 @@ class GmailLogin:
             self,
             tab: nd.Tab,
     ):
-        # Import here to avoid multiprocessing import issues on Windows
-        from nodrive_gpm_package.utils import UtilActions
         try:
             logger.info("Google Authenticator ...")
             await UtilActions.click(
@@ -443,9 +699,10 @@ class GmailLogin:
                 parentTag="div",
                 rootTag="strong",
                 text="Google Authenticator",
-                timeDelayAction=3,
+                timeDelayAction=0.2,
                 scrollToElement="vertical",
             )
+            await self._wait_ready(tab=tab, probe_strategy={"rootTag": "input", "attributes": {"type": "tel"}})
         except Exception as e:
             # Google Authenticator option may not be available, which is fine
             logger.debug(f"Google Authenticator option not available: {e}")
@@ -461,9 +718,10 @@ class GmailLogin:
         Returns:
             True if 2FA was detected and entered successfully
             False if 2FA was not detected (login may have succeeded or different flow)
+
+        Raises:
+            Exception: If 2FA was detected but entering the code failed
         """
-        # Import here to avoid multiprocessing import issues on Windows
-        from nodrive_gpm_package.utils import UtilActions
         try:
             logger.info("Check 2FA...")
             await UtilActions.getElement(
@@ -473,15 +731,17 @@ class GmailLogin:
                 text="2-Step Verification",
                 timeout=5,
             )
-            logger.info("2FA detected, entering code...")
-            await self._enter_code_2FA(tab=tab, account_email=account_email)
-            return True
         except (IndexError, Exception) as e:
             # 2FA not detected - this is normal if login succeeded without 2FA
             # IndexError can occur if UtilActions.getElement can't find the element
             logger.debug(f"2FA not detected (may have logged in successfully): {e}")
             return False
 
+        # Failures past detection propagate, the code must not be entered a second time
+        logger.info("2FA detected, entering code...")
+        await self._enter_code_2FA(tab=tab, account_email=account_email)
+        return True
+
     async def _enter_code_2FA(
             self,
             tab: nd.Tab,
@@ -496,163 +756,59 @@ class GmailLogin:
         if not account_email.code2FA:
             raise ValueError("2FA code is required but not provided")
 
-        # Import here to avoid multiprocessing import issues on Windows
-        from nodrive_gpm_package.utils import UtilDecode, UtilActions
-
         countWrong = 0
         maxCountWrong = 2
         maxAttempts = 3  # Maximum total attempts to prevent infinite loop
 
+        code2fa = account_email.code2FA
+        logger.debug(f"code2fa: {code2fa}")
+        # TOTP codes only change when the 30s window rolls over, _cached_totp decodes once per window
+        code2faDecode = None
+        last_decode_window = None
+        submitted_window = None
+
         attempt = 0
         while attempt < maxAttempts:
             attempt += 1
-            code2fa = account_email.code2FA
             logger.info(f"Attempting 2FA code (attempt {attempt}/{maxAttempts})")
-            logger.debug(f"code2fa: {code2fa}")
 
-            try:
-                code2faDecode = UtilDecode.code2Fa(code2fa)
-                logger.debug(f"code2faDecode: {code2faDecode}")
-            except Exception as e:
-                logger.error(f"Error decoding 2FA code: {e}")
-                raise
-
-            # Try multiple strategies to input 2FA code
-            # Based on HTML: input with id="totpPin", name="totpPin", type="tel", aria-label="Nhập mã" (Vietnamese) or "Enter code" (English)
-            input_strategies = [
-                # Strategy 1: Use input ID (most reliable)
-                {
-                    "rootTag": "input",
-                    "attributes": {"id": "totpPin"},
-                    "contentInput": code2faDecode,
-                    "typeSendKey": "human",
-                    "isRemove": True,
-                    "timeDelayAction": 2,
-                    "timeout": 10,
-                },
-                # Strategy 2: Use input name
-                {
-                    "rootTag": "input",
-                    "attributes": {"name": "totpPin"},
-                    "contentInput": code2faDecode,
-                    "typeSendKey": "human",
-                    "isRemove": True,
-                    "timeDelayAction": 2,
-                    "timeout": 10,
-                },
-                # Strategy 3: Use aria-label in Vietnamese
-                {
-                    "rootTag": "input",
-                    "attributes": {"aria-label": "Nhập mã"},
-                    "contentInput": code2faDecode,
-                    "typeSendKey": "human",
-                    "isRemove": True,
-                    "timeDelayAction": 2,
-                    "timeout": 10,
-                },
-                # Strategy 4: Use aria-label in English
-                {
-                    "rootTag": "input",
-                    "attributes": {"aria-label": "Enter code"},
-                    "contentInput": code2faDecode,
-                    "typeSendKey": "human",
-                    "isRemove": True,
-                    "timeDelayAction": 2,
-                    "timeout": 10,
-                },
-                # Strategy 5: Use type="tel" with jsname
-                {
-                    "rootTag": "input",
-                    "attributes": {"type": "tel", "jsname": "YPqjbf"},
-                    "contentInput": code2faDecode,
-                    "typeSendKey": "human",
-                    "isRemove": True,
-                    "timeDelayAction": 2,
-                    "timeout": 10,
-                },
-                # Strategy 6: Use type="tel" only
-                {
-                    "rootTag": "input",
-                    "attributes": {"type": "tel"},
-                    "contentInput": code2faDecode,
-                    "typeSendKey": "human",
-                    "isRemove": True,
-                    "timeDelayAction": 2,
-                    "timeout": 10,
-                },
-            ]
-            
-            input_success = False
-            for input_strategy in input_strategies:
-                try:
-                    logger.debug(f"Trying 2FA input strategy: {input_strategy.get('attributes', {})}")
-                    await UtilActions.sendKey(tab=tab, **input_strategy)
-                    input_success = True
-                    logger.info("✅ Successfully entered 2FA code")
-                    break
-                except Exception as e:
-                    logger.debug(f"2FA input strategy failed: {e}")
-                    continue
-            
-            if not input_success:
-                raise Exception("Could not find 2FA input field with any strategy")
+            # Never submit a code about to expire, nor the code of a window already rejected
+            seconds_left = self.TOTP_PERIOD - time.time() % self.TOTP_PERIOD
+            if seconds_left < self.TOTP_MIN_SECONDS_LEFT or time.time() // self.TOTP_PERIOD == submitted_window:
+                logger.info(f"Waiting {seconds_left:.0f}s for the next 2FA code window...")
+                await asyncio.sleep(seconds_left + 1)
 
-            logger.info("Next")
-            # Try multiple strategies to click Next button (supports both English and Vietnamese)
-            next_strategies = [
-                {"rootTag": "button", "attributes": {"id": "identifierNext"}, "timeout": 5},
-                {"rootTag": "button", "attributes": {"jsname": "LgbsSe"}, "timeout": 5},
-                {"parentTag": "button", "rootTag": "span", "text": "Next", "timeout": 5},
-                {"parentTag": "button", "rootTag": "span", "text": "Tiếp theo", "timeout": 5},
-                {"rootTag": "button", "text": "Next", "timeout": 5},
-                {"rootTag": "button", "text": "Tiếp theo", "timeout": 5},
-            ]
-            next_clicked = False
-            for next_strategy in next_strategies:
+            current_window = int(time.time() // self.TOTP_PERIOD)
+            if current_window != last_decode_window:
                 try:
-                    await UtilActions.click(tab=tab, **next_strategy)
-                    next_clicked = True
-                    logger.info("✅ Successfully clicked Next button after 2FA code")
-                    break
+                    code2faDecode = _cached_totp(code2fa, current_window)
+                    last_decode_window = current_window
+                    logger.debug(f"code2faDecode: {code2faDecode}")
                 except Exception as e:
-                    logger.debug(f"Next button click strategy failed after 2FA: {e}")
-                    continue
-            
-            if not next_clicked:
-                raise Exception("Could not click Next button after 2FA code")
+                    logger.error(f"Error decoding 2FA code: {e}")
+                    raise
 
             try:
-                logger.info("Checking if 2FA code was accepted...")
-                # Check for wrong code message in both English and Vietnamese
-                wrong_code_found = False
-                wrong_code_messages = ["Wrong code", "Mã không đúng", "Sai mã"]  # English, Vietnamese variations
-                
-                for wrong_msg in wrong_code_messages:
-                    try:
-                        await UtilActions.getElement(
-                            tab=tab,
-                            text=wrong_msg,
-                            timeout=3,
-                            timeDelay=1,
-                        )
-                        wrong_code_found = True
-                        logger.warning(f"Wrong 2FA code message found: {wrong_msg}")
-                        break
-                    except (IndexError, Exception):
-                        continue
-                
-                if wrong_code_found:
-                    countWrong += 1
-                    logger.warning(f"Wrong 2FA code entered (attempt {countWrong}/{maxCountWrong})")
-                else:
-                    # "Wrong code" element not found means code was accepted
-                    logger.debug("Wrong code message not found (code likely accepted)")
-                    logger.info("2FA code accepted successfully")
-                    return True
-            except (IndexError, Exception) as e:
-                # "Wrong code" element not found means code was accepted
-                # IndexError can occur if UtilActions.getElement can't find the element
-                logger.debug(f"2FA code check element not found (code likely accepted): {e}")
+                code_input = await tab.select(self.CODE2FA_INPUT_SELECTOR, timeout=10)
+            except Exception as e:
+                logger.debug(f"2FA input lookup failed: {e}")
+                code_input = None
+            if not code_input:
+                raise Exception("Could not find 2FA input field")
+
+            await self._insert_text(tab=tab, element=code_input, text=code2faDecode)
+            logger.info("✅ Successfully entered 2FA code")
+
+            logger.info("Next")
+            wrong_code_text = await self._submit_code_2FA(tab=tab)
+            submitted_window = last_decode_window
+            if wrong_code_text:
+                countWrong += 1
+                logger.warning(f"Wrong 2FA code message found: {wrong_code_text}")
+                logger.warning(f"Wrong 2FA code entered (attempt {countWrong}/{maxCountWrong})")
+            else:
+                # "Wrong code" message not found means code was accepted
+                logger.debug("Wrong code message not found (code likely accepted)")
                 logger.info("2FA code accepted successfully")
                 return True
 
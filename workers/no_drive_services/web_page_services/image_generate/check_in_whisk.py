@@ -1,9 +1,57 @@
 import asyncio
+import json
 
 from loguru import logger
 
+from workers.no_drive_services.web_page_services.page_script import evaluate_value
+
+
+# Enabled button whose text contains 'enter tool' (case-insensitive), matched natively
+_ENTER_TOOL_XPATH = (
+    '//button[not(@disabled)]'
+    '[contains(translate(., "ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz"), "enter tool")]'
+)
+_FIND_ENTER_TOOL_BY_TEXT_JS = (
+    f"document.evaluate({json.dumps(_ENTER_TOOL_XPATH)}, document, null, "
+    "XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue"
+)
+
 
 class CheckInWhisk:
+    # Try a narrow attribute selector first and only fall back to the text
+    # XPath when it misses.
+    ENTER_TOOL_JS = """
+        (() => {
+            const button = document.querySelector(
+                'button[aria-label*="enter tool" i]:not([disabled])'
+            ) || %s;
+            if (button) {
+                // Scroll into view (instant scrolling is synchronous, no settle wait needed)
+                button.scrollIntoView({ behavior: 'instant', block: 'nearest' });
+
+                // Check if button is visible
+                const rect = button.getBoundingClientRect();
+                const style = window.getComputedStyle(button);
+                const isVisible = rect.width > 0 && rect.height > 0 &&
+                                style.display !== 'none' &&
+                                style.visibility !== 'hidden';
+
+                if (isVisible) {
+                    button.click();
+                    return true;
+                }
+            }
+            return false;
+        })()
+    """ % _FIND_ENTER_TOOL_BY_TEXT_JS
+
+    # Readiness probe: page loaded and an 'Enter tool' button rendered
+    ENTER_TOOL_READY_JS = """
+        document.readyState === 'complete' && !!%s
+    """ % _FIND_ENTER_TOOL_BY_TEXT_JS
+    ENTER_TOOL_MAX_WAIT = 10  # seconds
+    ENTER_TOOL_POLL_INTERVAL = 0.1  # seconds
+
     def __init__(self, tab, whisk_url):
         self.tab = tab
         self.whisk_url = whisk_url
@@ -16,45 +64,15 @@ class CheckInWhisk:
             bool: True if button was clicked successfully (already inside), False otherwise
         """
         await self.tab.get(self.whisk_url)
-        import random
-        await asyncio.sleep(random.uniform(2.1, 3.1))
-        await self.tab.reload()
-        await asyncio.sleep(random.uniform(2.1, 3.1))
-        await self.tab.reload()
-        await asyncio.sleep(random.uniform(2.1, 3.1))
+        await self._wait_for_enter_tool()
 
         try:
             # Strategy 1: Try using JavaScript to find and click by text content (most reliable for nested elements)
             logger.info("Attempting to click 'Enter tool' button...")
             try:
-                clicked = await self.tab.evaluate("""
-                    async () => {
-                        const buttons = Array.from(document.querySelectorAll('button'));
-                        const button = buttons.find(btn => {
-                            const text = (btn.textContent || btn.innerText || '').trim();
-                            return text.toLowerCase().includes('enter tool');
-                        });
-                        if (button) {
-                            // Scroll into view
-                            button.scrollIntoView({ behavior: 'smooth', block: 'center' });
-                            await new Promise(resolve => setTimeout(resolve, 500));
-
-                            // Check if button is visible and enabled
-                            const rect = button.getBoundingClientRect();
-                            const isVisible = rect.width > 0 && rect.height > 0 && 
-                                            window.getComputedStyle(button).display !== 'none' &&
-                                            window.getComputedStyle(button).visibility !== 'hidden';
-
-                            if (isVisible && !button.disabled) {
-                                button.click();
-                                return true;
-                            }
-                        }
-                        return false;
-                    }
-                """, await_promise=True)
-
-                if clicked:
+                clicked = await evaluate_value(self.tab, self.ENTER_TOOL_JS, await_promise=True)
+
+                if clicked is True:
                     await asyncio.sleep(1)
                     logger.info("✅ Successfully clicked 'Enter tool' button (JavaScript method)")
                     return True
@@ -63,7 +81,7 @@ class CheckInWhisk:
             except Exception as e1:
                 logger.debug(f"JavaScript click method failed: {e1}")
 
-            # Strategy 2: Try with text matching using UtilActions (contains)
+            # Strategy 2: Fall back to UtilActions text matching (contains also covers exact matches)
             # Import here to avoid multiprocessing import issues on Windows
             from nodrive_gpm_package.utils import UtilActions
             try:
@@ -72,7 +90,7 @@ class CheckInWhisk:
                     rootTag="button",
                     text="Enter tool",
                     timeDelayAction=2,
-                    timeout=15,
+                    timeout=5,
                     scrollToElement="vertical",
                     isContains=True,
                     isGoOnTop=True,
@@ -82,23 +100,6 @@ class CheckInWhisk:
             except Exception as e2:
                 logger.debug(f"UtilActions text match failed: {e2}")
 
-            # Strategy 3: Try with exact text match
-            try:
-                await UtilActions.click(
-                    tab=self.tab,
-                    rootTag="button",
-                    text="Enter tool",
-                    timeDelayAction=2,
-                    timeout=15,
-                    scrollToElement="vertical",
-                    isContains=False,
-                    isGoOnTop=True,
-                )
-                logger.info("✅ Successfully clicked 'Enter tool' button (exact match)")
-                return True
-            except Exception as e3:
-                logger.debug(f"Exact match failed: {e3}")
-
             # If all strategies fail, log error and return False
             logger.warning("❌ All strategies failed to click 'Enter tool' button - will proceed with Gmail login")
             return False
@@ -106,3 +107,23 @@ class CheckInWhisk:
         except Exception as e:
             logger.error(f"Error clicking 'Enter tool' button: {e}")
             return False
+
+    async def _wait_for_enter_tool(self):
+        """
+        Wait until the page is loaded and the 'Enter tool' button is rendered.
+
+        Returns early as soon as the button shows up; once ENTER_TOOL_MAX_WAIT
+        elapses the click strategies run anyway.
+        """
+        # Let the initial paint happen before probing
+        await asyncio.sleep(0.5)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.ENTER_TOOL_MAX_WAIT
+        while loop.time() < deadline:
+            try:
+                if await evaluate_value(self.tab, self.ENTER_TOOL_READY_JS):
+                    return
+            except Exception as e:
+                logger.debug(f"'Enter tool' readiness probe failed: {e}")
+            await asyncio.sleep(self.ENTER_TOOL_POLL_INTERVAL)
+        logger.debug(f"'Enter tool' button not rendered after {self.ENTER_TOOL_MAX_WAIT}s")
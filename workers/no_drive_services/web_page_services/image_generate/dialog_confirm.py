@@ -5,6 +5,100 @@ import nodriver as nd
 from loguru import logger
 from nodrive_gpm_package.utils import UtilActions
 
+from workers.no_drive_services.web_page_services.page_script import evaluate_value
+
+
+# Clicks "I agree" in the open upload dialog, then reports whether the dialog closed.
+# Built once at import; buttons are located with querySelector / NodeList scans
+# instead of materializing arrays, and visibility uses offsetParent.
+_DIALOG_AGREE_JS = """
+    (async () => {
+        const findAgreeButton = (dialog) => {
+            const byTestId = dialog.querySelector('button[data-testid="agree"]:not([disabled])');
+            if (byTestId) {
+                return byTestId;
+            }
+            const buttons = dialog.querySelectorAll('button:not([disabled])');
+            const textOf = (btn) => (btn.textContent || btn.innerText || '').trim().toLowerCase();
+            // Method 1: Find by text content
+            // Method 2: If not found, take the first button that's not Cancel
+            return Array.prototype.find.call(buttons, btn => textOf(btn) === 'i agree') ||
+                Array.prototype.find.call(buttons, btn => {
+                    const text = textOf(btn);
+                    return text !== 'cancel' && text.length > 0;
+                });
+        };
+
+        const clickAgree = () => {
+            // Look for dialog with role="dialog" and data-state="open"
+            for (const dialog of document.querySelectorAll('div[role="dialog"][data-state="open"]')) {
+                // Check if dialog is visible
+                const style = window.getComputedStyle(dialog);
+                if (style.display === 'none' || style.visibility === 'hidden') {
+                    continue;
+                }
+
+                const agreeButton = findAgreeButton(dialog);
+                if (!agreeButton || agreeButton.offsetParent === null) {
+                    continue;
+                }
+
+                agreeButton.scrollIntoView({ behavior: 'instant', block: 'center' });
+
+                // Try multiple click methods
+                try {
+                    // Method 1: Direct click
+                    agreeButton.click();
+                    return true;
+                } catch (e1) {
+                    try {
+                        // Method 2: MouseEvent
+                        agreeButton.dispatchEvent(new MouseEvent('click', {
+                            view: window,
+                            bubbles: true,
+                            cancelable: true,
+                            buttons: 1
+                        }));
+                        return true;
+                    } catch (e2) {
+                        try {
+                            // Method 3: Focus and Enter key
+                            agreeButton.focus();
+                            const keyInit = { key: 'Enter', code: 'Enter', keyCode: 13, bubbles: true };
+                            agreeButton.dispatchEvent(new KeyboardEvent('keydown', keyInit));
+                            agreeButton.dispatchEvent(new KeyboardEvent('keyup', keyInit));
+                            return true;
+                        } catch (e3) {
+                            console.error('All click methods failed:', e1, e2, e3);
+                            return false;
+                        }
+                    }
+                }
+            }
+            return false;
+        };
+
+        if (!clickAgree()) {
+            return { clicked: false, closed: false };
+        }
+
+        // Wait for dialog to close
+        await new Promise(resolve => setTimeout(resolve, 500));
+
+        // Verify dialog is closed or hidden
+        for (const dialog of document.querySelectorAll('div[role="dialog"][data-state="open"]')) {
+            const style = window.getComputedStyle(dialog);
+            if (style.display !== 'none' && style.visibility !== 'hidden') {
+                return { clicked: true, closed: false };
+            }
+        }
+        return { clicked: true, closed: true };
+    })()
+"""
+
+
+_OPEN_DIALOG_SELECTOR = 'div[role="dialog"][data-state="open"]'
+
 
 class DialogConfirm:
     """Handles confirmation dialogs that appear during image uploads."""
@@ -16,123 +110,21 @@ class DialogConfirm:
         max_retries = 5
         retry_delay = 0.8
 
+        # Wait for the dialog itself instead of sleeping before every attempt
+        try:
+            await tab.wait_for(selector=_OPEN_DIALOG_SELECTOR, timeout=4)
+        except asyncio.TimeoutError:
+            logger.debug("No upload dialog appeared, continuing...")
+            return
+
         for attempt in range(max_retries):
             try:
-                # Wait for dialog to appear
-                await asyncio.sleep(retry_delay)
-
-                # Use JavaScript to find and click the button directly
-                clicked = await tab.evaluate("""
-                    () => {
-                        // Look for dialog with role="dialog" and data-state="open"
-                        const dialogs = Array.from(document.querySelectorAll('div[role="dialog"][data-state="open"]'));
-
-                        for (const dialog of dialogs) {
-                            // Check if dialog is visible
-                            const style = window.getComputedStyle(dialog);
-                            if (style.display === 'none' || style.visibility === 'hidden') {
-                                continue;
-                            }
-
-                            // Find "I agree" button - try multiple ways
-                            let agreeButton = null;
-
-                            // Method 1: Find by text content
-                            const buttons = Array.from(dialog.querySelectorAll('button'));
-                            agreeButton = buttons.find(btn => {
-                                const text = (btn.textContent || btn.innerText || '').trim();
-                                return text.toLowerCase() === 'i agree';
-                            });
-
-                            // Method 2: If not found, try finding button that's not Cancel
-                            if (!agreeButton) {
-                                agreeButton = buttons.find(btn => {
-                                    const text = (btn.textContent || btn.innerText || '').trim().toLowerCase();
-                                    return text !== 'cancel' && text.length > 0;
-                                });
-                            }
-
-                            if (agreeButton) {
-                                // Check if button is visible and enabled
-                                const btnStyle = window.getComputedStyle(agreeButton);
-                                if (btnStyle.display === 'none' || btnStyle.visibility === 'hidden' || agreeButton.disabled) {
-                                    continue;
-                                }
-
-                                // Scroll into view
-                                agreeButton.scrollIntoView({ behavior: 'instant', block: 'center' });
-
-                                // Try multiple click methods
-                                try {
-                                    // Method 1: Direct click
-                                    agreeButton.click();
-                                    return true;
-                                } catch (e1) {
-                                    try {
-                                        // Method 2: MouseEvent
-                                        const mouseEvent = new MouseEvent('click', {
-                                            view: window,
-                                            bubbles: true,
-                                            cancelable: true,
-                                            buttons: 1
-                                        });
-                                        agreeButton.dispatchEvent(mouseEvent);
-                                        return true;
-                                    } catch (e2) {
-                                        try {
-                                            // Method 3: Focus and Enter key
-                                            agreeButton.focus();
-                                            const keyEvent = new KeyboardEvent('keydown', {
-                                                key: 'Enter',
-                                                code: 'Enter',
-                                                keyCode: 13,
-                                                bubbles: true
-                                            });
-                                            agreeButton.dispatchEvent(keyEvent);
-                                            const keyUpEvent = new KeyboardEvent('keyup', {
-                                                key: 'Enter',
-                                                code: 'Enter',
-                                                keyCode: 13,
-                                                bubbles: true
-                                            });
-                                            agreeButton.dispatchEvent(keyUpEvent);
-                                            return true;
-                                        } catch (e3) {
-                                            console.error('All click methods failed:', e1, e2, e3);
-                                            return false;
-                                        }
-                                    }
-                                }
-                            }
-                        }
-                        return false;
-                    }
-                """, await_promise=True)
+                # Use JavaScript to click the button and verify the dialog closed in one call
+                result = await evaluate_value(tab, _DIALOG_AGREE_JS, await_promise=True)
 
-                if clicked:
+                if isinstance(result, dict) and result.get("clicked"):
                     logger.info("✅ Clicked 'I agree' button")
-                    # Wait for dialog to close
-                    await asyncio.sleep(0.5)
-
-                    # Verify dialog is closed
-                    dialog_closed = await tab.evaluate("""
-                        () => {
-                            const dialogs = Array.from(document.querySelectorAll('div[role="dialog"]'));
-                            for (const dialog of dialogs) {
-                                const dataState = dialog.getAttribute('data-state');
-                                const style = window.getComputedStyle(dialog);
-                                // Check if dialog is closed or hidden
-                                if (dataState === 'open' && 
-                                    style.display !== 'none' && 
-                                    style.visibility !== 'hidden') {
-                                    return false;
-                                }
-                            }
-                            return true;
-                        }
-                    """, await_promise=True)
-
-                    if dialog_closed:
+                    if result.get("closed"):
                         logger.info("✅ Dialog closed successfully")
                         return
                     else:
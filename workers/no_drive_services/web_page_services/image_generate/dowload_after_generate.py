@@ -8,13 +8,47 @@ import nodriver as nd
 from loguru import logger
 from nodrive_gpm_package.utils import UtilDownloadFile
 
+from workers.no_drive_services.web_page_services.page_script import evaluate_value
+
+# Resolved once at import; generated images are stored next to this module
+_MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+
 
 class DownloadAfterGenerate:
+    # src of the <img> in every draggable image card (inputs first, then generated images)
+    _IMAGE_SRCS_JS = """
+        (() => {
+            // Without the DnD anchor only the uploaded inputs are listed, nothing generated yet
+            const anchor = document.querySelector("div[id^='DndDescribedBy-']");
+            if (!anchor) {
+                return [];
+            }
+            const srcs = [];
+            const selector = `div[aria-roledescription="draggable"][aria-describedby="${anchor.id}"]`;
+            for (const card of document.querySelectorAll(selector)) {
+                const img = card.querySelector('img');
+                if (img) {
+                    srcs.push(img.getAttribute('src'));
+                }
+            }
+            return srcs;
+        })()
+    """
+
     def __init__(
             self,
             constants,
     ):
         self.constants = constants
+        # Page index -> file name, built once from the constants
+        self._file_name_map = {
+            0: constants.FILE_THUMB,
+            1: constants.FILE_PAGE_1,
+            2: constants.FILE_PAGE_2,
+            3: constants.FILE_NICHE_3,
+            4: constants.FILE_NICHE_4,
+            5: constants.FILE_NICHE_5,
+        }
 
     async def download(
             self,
@@ -39,9 +73,13 @@ class DownloadAfterGenerate:
     async def _wait_for_generation_and_get_url(self, tab: nd.Tab, total_inputs: int) -> str:
         logger.info("⏳ Waiting for image generation...")
         src_url = None
-        for _ in range(self.constants.MAX_GENERATION_CHECK):
-            # Check if still generating
-            await asyncio.sleep(self.constants.SLEEP_AFTER_GENERATION_CHECK)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.constants.MAX_GENERATION_SECONDS
+        delay = self.constants.GENERATION_CHECK_MIN_INTERVAL
+        while loop.time() < deadline:
+            # Check if still generating, backing off while generation takes long
+            await asyncio.sleep(delay)
+            delay = min(delay * self.constants.GENERATION_CHECK_BACKOFF, self.constants.SLEEP_AFTER_GENERATION_CHECK)
             images_generated = await self._is_generating(tab, total_inputs)
             if images_generated is None:
                 logger.debug("🧬 Still generating...")
@@ -60,15 +98,7 @@ class DownloadAfterGenerate:
         return src_url
 
     def _get_file_name(self, current_page: int) -> str:
-        file_name_map = {
-            0: self.constants.FILE_THUMB,
-            1: self.constants.FILE_PAGE_1,
-            2: self.constants.FILE_PAGE_2,
-            3: self.constants.FILE_NICHE_3,
-            4: self.constants.FILE_NICHE_4,
-            5: self.constants.FILE_NICHE_5,
-        }
-        return file_name_map.get(current_page, f"image_page_{current_page}")
+        return self._file_name_map.get(current_page, f"image_page_{current_page}")
 
     async def _download_image(
             self,
@@ -88,9 +118,7 @@ class DownloadAfterGenerate:
         """
         try:
             # Determine storage directory
-            current_file_path = os.path.abspath(__file__)
-            current_dir = os.path.dirname(current_file_path)
-            dir_store = os.path.join(current_dir, "generated", "images", account_email)
+            dir_store = os.path.join(_MODULE_DIR, "generated", "images", account_email)
 
             # Download file
             file_path = await UtilDownloadFile.download(
@@ -102,50 +130,46 @@ class DownloadAfterGenerate:
             logger.error(f"❌ Failed to download image: {e}")
             return False
 
-    async def _is_generating(self, tab: nd.Tab, total_inputs: int) -> Optional[list[nd.Element]]:
-        try:
-            div_targets = await tab.query_selector_all("div[id^='DndDescribedBy-']")
-            div_target = div_targets[0] if div_targets else None
+    async def _is_generating(self, tab: nd.Tab, total_inputs: int) -> Optional[list[str]]:
+        """
+        Collect the src of every generated image with a single evaluate call.
 
-            root_imgs = await tab.query_selector_all(
-                f'div[aria-roledescription="draggable"][aria-describedby="{div_target.attrs.get("id")}"]' if div_target else 'div[aria-roledescription="draggable"]'
-            )
+        Args:
+            tab: Browser tab instance
+            total_inputs: Number of uploaded input images listed before the generated ones
 
-            if not root_imgs:
+        Returns:
+            The generated image srcs, or None while nothing has been generated yet
+        """
+        try:
+            srcs = await evaluate_value(tab, self._IMAGE_SRCS_JS)
+            if not isinstance(srcs, list) or not srcs:
                 return None
 
-            imgs = []
-            for root_img in root_imgs:
-                img = await root_img.query_selector("img")
-                if img:
-                    imgs.append(img)
-
-            total_images_generated = len(imgs) - total_inputs
+            total_images_generated = len(srcs) - total_inputs
 
             logger.info(f"🔢 Number of images generated: {total_images_generated}")
 
-            if not total_images_generated:
+            if total_images_generated <= 0:
                 return None
 
-            return imgs[total_inputs:]
+            return srcs[total_inputs:]
         except Exception:
             return None
 
-    async def _get_generated_image_url(self, images_generated: list[nd.Element]) -> str:
+    async def _get_generated_image_url(self, urls: list[str]) -> str:
         """
         Get the URL of a generated image.
 
         Args:
-            tab: Browser tab instance
+            urls: Generated image srcs, oldest first
 
         Returns:
             Image URL or None if not found
         """
         try:
-            # img_random: nd.Element = random.choice(images_generated[-2:])
             # Get the last image from the list
-            img_random: nd.Element = images_generated[-1]
-            src_url = img_random.attrs.get("src")
+            src_url = urls[-1]
             logger.info(f"🔢 Selected image src: {src_url}")
 
             return src_url
@@ -1,7 +1,11 @@
+import asyncio
+import glob
 import hashlib
 import os
 import shutil
 import tempfile
+import threading
+import time
 from pathlib import Path
 from typing import Optional
 from urllib.parse import urlparse
@@ -11,49 +15,88 @@ from loguru import logger
 
 from src.enums.EFolderImageAI import EFolderImageAI
 from src.schemas.manager_image_ai_item_store import ManagerImageAIItemStore
+from workers.no_drive_services.web_page_services.image_generate.image_lists import ImageLists
 
 
 class DownloadImageLocal:
+    # Image MIME type -> file extension
+    _CONTENT_TYPE_EXTENSIONS = {
+        'image/png': '.png',
+        'image/jpeg': '.jpg',
+        'image/jpg': '.jpg',
+        'image/gif': '.gif',
+        'image/webp': '.webp',
+    }
+    # Downloaded URL images are kept here across tasks (and browser processes),
+    # named by a hash of their URL, so a catalog image is only fetched once
+    CACHE_DIR = os.path.join(tempfile.gettempdir(), "whisk_image_cache")
+    # Source URL -> cached local path, shared by all instances in this process
+    _url_cache: dict[str, str] = {}
+    # Cached images older than this are downloaded again, so a changed image behind the same URL is picked up
+    CACHE_MAX_AGE = 24 * 60 * 60  # seconds
+    # Oldest cached images are evicted once the directory grows past this
+    CACHE_MAX_BYTES = 512 * 1024 * 1024
+    # The cache is pruned once per process, on the first prepare
+    _cache_pruned = False
+
     def __init__(
             self,
             temp_download_dir: Optional[str] = None,
-            list_image_subject: list[str] = None,
-            list_image_scene: list[str] = None,
-            list_image_style: list[str] = None,
+            image_lists: Optional[ImageLists] = None,
     ):
         self._temp_download_dir = temp_download_dir
-        self.list_image_subject = list_image_subject
-        self.list_image_scene = list_image_scene
-        self.list_image_style = list_image_style
+        self.image_lists = image_lists if image_lists is not None else ImageLists()
+        # Reused across downloads so connections to the image host are kept alive
+        self._session: Optional[requests.Session] = None
 
     async def prepare_manager_images(
             self,
             manager_image_ai_item_store: list[ManagerImageAIItemStore]
     ):
-        self._temp_download_dir = tempfile.mkdtemp(prefix="whisk_images_")
-        logger.info(f"Created temporary directory for images: {self._temp_download_dir}")
+        if not self._temp_download_dir:
+            self._temp_download_dir = tempfile.mkdtemp(prefix="whisk_images_")
+            logger.info(f"Created temporary directory for images: {self._temp_download_dir}")
+        if self._session is None:
+            self._session = requests.Session()
+        if not DownloadImageLocal._cache_pruned:
+            DownloadImageLocal._cache_pruned = True
+            await asyncio.to_thread(self._prune_cache)
 
-        for manager_image_ai_item in manager_image_ai_item_store:
-            try:
-                local_path = await self._download_image_to_local(
-                    manager_image_ai_item.file,
-                    manager_image_ai_item.typeFolderStore
-                )
-
-                if local_path:
-                    if manager_image_ai_item.typeFolderStore == EFolderImageAI.SUBJECT:
-                        self.list_image_subject.append(local_path)
-                    elif manager_image_ai_item.typeFolderStore == EFolderImageAI.SCENE:
-                        self.list_image_scene.append(local_path)
-                    elif manager_image_ai_item.typeFolderStore == EFolderImageAI.STYLE:
-                        self.list_image_style.append(local_path)
+        # Download all images concurrently; gather keeps the input order
+        results = await asyncio.gather(
+            *(
+                self._download_image_to_local(item.file, item.typeFolderStore)
+                for item in manager_image_ai_item_store
+            ),
+            return_exceptions=True,
+        )
 
-            except Exception as e:
-                logger.warning(f"Failed to download image {manager_image_ai_item.file}: {e}")
+        for manager_image_ai_item, local_path in zip(manager_image_ai_item_store, results):
+            if isinstance(local_path, BaseException):
+                logger.warning(f"Failed to download image {manager_image_ai_item.file}: {local_path}")
+                continue
+            if local_path:
+                self.image_lists.add(manager_image_ai_item.typeFolderStore, local_path)
 
     async def _download_image_to_local(self, file_path_or_url: str, folder_type: EFolderImageAI) -> Optional[str]:
         """
         Download an image from URL or copy from local path to temporary directory.
+
+        The blocking HTTP request and file I/O run in a worker thread so the
+        event loop keeps serving the browser tab meanwhile.
+
+        Args:
+            file_path_or_url: URL or local file path
+            folder_type: Type of folder (SUBJECT, SCENE, STYLE)
+
+        Returns:
+            Local file path if successful, None otherwise
+        """
+        return await asyncio.to_thread(self._sync_download_image_to_local, file_path_or_url, folder_type)
+
+    def _sync_download_image_to_local(self, file_path_or_url: str, folder_type: EFolderImageAI) -> Optional[str]:
+        """
+        Blocking implementation of _download_image_to_local.
         
         Args:
             file_path_or_url: URL or local file path
@@ -68,52 +111,27 @@ class DownloadImageLocal:
             is_url = parsed.scheme in ('http', 'https')
 
             if is_url:
-                # Download from URL using requests
-                response = requests.get(file_path_or_url, stream=True, timeout=30)
-                if response.status_code == 200:
-                    # Get file extension from content type or URL
-                    content_type = response.headers.get('Content-Type', '')
-                    ext = '.jpg'  # default
-                    if 'image/png' in content_type:
-                        ext = '.png'
-                    elif 'image/jpeg' in content_type or 'image/jpg' in content_type:
-                        ext = '.jpg'
-                    elif 'image/gif' in content_type:
-                        ext = '.gif'
-                    elif 'image/webp' in content_type:
-                        ext = '.webp'
-                    else:
-                        # Try to get from URL
-                        path = Path(parsed.path)
-                        if path.suffix:
-                            ext = path.suffix
-
-                    # Generate unique filename
-                    file_hash = hashlib.md5(file_path_or_url.encode()).hexdigest()[:8]
-                    filename = f"{folder_type.value}_{file_hash}{ext}"
-                    local_path = os.path.join(self._temp_download_dir, filename)
-
-                    # Save file
-                    with open(local_path, 'wb') as f:
-                        for chunk in response.iter_content(chunk_size=8192):
-                            if chunk:
-                                f.write(chunk)
-
-                    logger.info(f"✅ Downloaded image from URL to: {local_path}")
-                    return local_path
-                else:
-                    logger.warning(f"Failed to download image: HTTP {response.status_code}")
+                cached_path = self._get_cached_path(file_path_or_url) or self._download_to_cache(file_path_or_url)
+                if not cached_path:
                     return None
+                try:
+                    return self._copy_to_task_dir(cached_path, folder_type)
+                except FileNotFoundError:
+                    # Evicted by another process's prune between lookup and copy
+                    DownloadImageLocal._url_cache.pop(file_path_or_url, None)
+                    cached_path = self._download_to_cache(file_path_or_url)
+                    return self._copy_to_task_dir(cached_path, folder_type) if cached_path else None
             else:
                 # It's a local path - check if file exists
                 if os.path.exists(file_path_or_url) and os.path.isfile(file_path_or_url):
                     # Copy to temp directory
-                    file_hash = hashlib.md5(file_path_or_url.encode()).hexdigest()[:8]
+                    file_hash = hashlib.blake2b(file_path_or_url.encode(), digest_size=4).hexdigest()
                     ext = Path(file_path_or_url).suffix or '.jpg'
                     filename = f"{folder_type.value}_{file_hash}{ext}"
                     local_path = os.path.join(self._temp_download_dir, filename)
 
-                    shutil.copy2(file_path_or_url, local_path)
+                    # copyfile skips metadata and uses the kernel fast-copy path where available
+                    shutil.copyfile(file_path_or_url, local_path)
                     logger.debug(f"Copied local image to: {local_path}")
                     return local_path
                 else:
@@ -124,11 +142,142 @@ class DownloadImageLocal:
             logger.error(f"Error downloading image {file_path_or_url}: {e}")
             return None
 
+    def _download_to_cache(self, url: str) -> Optional[str]:
+        """
+        Download a URL image into the shared cache directory.
+
+        Args:
+            url: Image URL
+
+        Returns:
+            Cached local path if successful, None otherwise
+        """
+        # Download from URL using requests
+        response = self._session.get(url, stream=True, timeout=30)
+        if response.status_code != 200:
+            logger.warning(f"Failed to download image: HTTP {response.status_code}")
+            return None
+
+        # Get file extension from content type or URL
+        mime_type = response.headers.get('Content-Type', '').split(';', 1)[0].strip().lower()
+        # Fall back to the URL suffix, then '.jpg'
+        ext = self._CONTENT_TYPE_EXTENSIONS.get(mime_type) or Path(urlparse(url).path).suffix or '.jpg'
+
+        os.makedirs(self.CACHE_DIR, exist_ok=True)
+        local_path = os.path.join(self.CACHE_DIR, f"{self._cache_key(url)}{ext}")
+        # Write under a private name and rename, so concurrent downloads
+        # of the same URL never expose a half-written file
+        part_path = f"{local_path}.{os.getpid()}.{threading.get_ident()}.part"
+
+        # Save file, streaming the raw body in C with a 64 KiB buffer
+        response.raw.decode_content = True
+        with open(part_path, 'wb') as f:
+            shutil.copyfileobj(response.raw, f, length=1 << 16)
+        os.replace(part_path, local_path)
+        DownloadImageLocal._url_cache[url] = local_path
+
+        logger.info(f"✅ Downloaded image from URL to: {local_path}")
+        return local_path
+
+    def _copy_to_task_dir(self, cached_path: str, folder_type: EFolderImageAI) -> str:
+        """
+        Copy a cached image into the per-task directory.
+
+        The task works on its own copy, so another process pruning the
+        shared cache cannot remove a file the task is about to upload.
+
+        Args:
+            cached_path: Path in the shared cache directory
+            folder_type: Type of folder (SUBJECT, SCENE, STYLE)
+
+        Returns:
+            Local file path in the per-task directory
+
+        Raises:
+            FileNotFoundError: If the cached file was evicted meanwhile
+        """
+        name = Path(cached_path).name
+        local_path = os.path.join(self._temp_download_dir, f"{folder_type.value}_{name}")
+        shutil.copyfile(cached_path, local_path)
+        logger.debug(f"Using cached image: {local_path}")
+        return local_path
+
+    @staticmethod
+    def _cache_key(url: str) -> str:
+        """Content-address key of a URL image in the cache directory."""
+        return hashlib.blake2b(url.encode(), digest_size=16).hexdigest()
+
+    def _get_cached_path(self, url: str) -> Optional[str]:
+        """
+        Look up a previously downloaded URL image.
+
+        Args:
+            url: Image URL
+
+        Returns:
+            Cached local path if the file still exists, None otherwise
+        """
+        cached_path = self._url_cache.get(url)
+        if cached_path and self._is_fresh(cached_path):
+            return cached_path
+        DownloadImageLocal._url_cache.pop(url, None)
+
+        # Another process may have downloaded it already
+        for path in glob.glob(os.path.join(self.CACHE_DIR, f"{self._cache_key(url)}.*")):
+            if not path.endswith('.part') and self._is_fresh(path):
+                DownloadImageLocal._url_cache[url] = path
+                return path
+        return None
+
+    def _is_fresh(self, path: str) -> bool:
+        """Whether a cached file exists and was downloaded less than CACHE_MAX_AGE ago."""
+        try:
+            return time.time() - os.stat(path).st_mtime < self.CACHE_MAX_AGE
+        except OSError:
+            return False
+
+    def _prune_cache(self):
+        """Delete expired cached images, then the oldest ones until the cache fits CACHE_MAX_BYTES."""
+        try:
+            entries = []
+            for entry in os.scandir(self.CACHE_DIR):
+                if entry.is_file():
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except FileNotFoundError:
+            return
+        except OSError as e:
+            logger.debug(f"Could not scan image cache: {e}")
+            return
+
+        now = time.time()
+        total = sum(size for _, size, _ in entries)
+        # Oldest first; expired files always go, the rest only while over the size cap
+        for mtime, size, path in sorted(entries):
+            expired = now - mtime >= self.CACHE_MAX_AGE
+            if not expired and total <= self.CACHE_MAX_BYTES:
+                break
+            if not expired and path.endswith('.part'):
+                continue  # Still being written by another download
+            try:
+                os.remove(path)
+                total -= size
+            except OSError as e:
+                logger.debug(f"Could not evict cached image {path}: {e}")
+
     def cleanup_temp_directory(self):
-        """Clean up temporary directory with downloaded images."""
+        """
+        Clean up the per-task temporary directory and close the HTTP session.
+
+        Cached URL images are kept for the next tasks.
+        """
+        if self._session is not None:
+            self._session.close()
+            self._session = None
         if self._temp_download_dir and os.path.exists(self._temp_download_dir):
             try:
                 shutil.rmtree(self._temp_download_dir)
                 logger.debug(f"Cleaned up temporary directory: {self._temp_download_dir}")
+                self._temp_download_dir = None
             except Exception as e:
                 logger.warning(f"Failed to cleanup temp directory: {e}")
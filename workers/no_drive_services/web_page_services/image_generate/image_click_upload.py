@@ -1,23 +1,52 @@
 import asyncio
+import json
 from typing import List
 
 import nodriver as nd
 from loguru import logger
 from nodrive_gpm_package.utils import UtilActions
 
+from workers.no_drive_services.web_page_services.image_generate.image_lists import ImageLists
+from workers.no_drive_services.web_page_services.page_script import evaluate_value
+
+_ADD_CATEGORY_SELECTOR = 'button[aria-label="Add new category"]'
+# JS string literal of the selector, passed to ADD_CATEGORY_CLICKS_JS
+_ADD_CATEGORY_SELECTOR_JS = json.dumps(_ADD_CATEGORY_SELECTOR)
+
 
 class ImageClickUpload:
+    # Clicks the i-th 'Add new category' button counts[i] times, yielding briefly
+    # between clicks so the page can apply each state update.
+    # Returns the number of clicks done per section.
+    ADD_CATEGORY_CLICKS_JS = """
+        (async (selector, counts) => {
+            const buttons = document.querySelectorAll(selector);
+            const clicked = [];
+            for (let i = 0; i < counts.length; i++) {
+                const button = buttons[i];
+                let done = 0;
+                if (button) {
+                    button.scrollIntoView({ behavior: 'instant', block: 'nearest' });
+                    for (; done < counts[i]; done++) {
+                        button.click();
+                        await new Promise(resolve => setTimeout(resolve, 50));
+                    }
+                }
+                clicked.push(done);
+            }
+            return clicked;
+        })(%s, %s)
+    """
+
     def __init__(
             self,
             constants,
-            list_image_subject,
-            list_image_scene,
-            list_image_style,
+            image_lists: ImageLists,
     ):
         self.constants = constants
-        self.list_image_subject = list_image_subject
-        self.list_image_scene = list_image_scene
-        self.list_image_style = list_image_style
+        self.image_lists = image_lists
+        # Section titles, in the order of the 'Add new category' buttons on the page
+        self._category_titles = (constants.TITLE_SUBJECT, constants.TITLE_SCENE, constants.TITLE_STYLE)
 
     async def click_add_images_button(self, tab: nd.Tab):
         """Click the 'Add Images' button and wait for panel to open."""
@@ -37,7 +66,7 @@ class ImageClickUpload:
         """
         Click the 'Add new category' button for each section (Subject, Scene, Style)
         based on the number of images available for that section.
-        Returns the total number of category inputs (Subject + Scene + Style).
+        Returns the total number of category inputs added (Subject + Scene + Style).
         """
         try:
             logger.debug("Preparing category inputs for Subject/Scene/Style")
@@ -52,32 +81,34 @@ class ImageClickUpload:
                 logger.warning("⚠️ No 'Add new category' buttons found")
                 return 0
 
-            category_counts = [
-                (self.constants.TITLE_SUBJECT, len(self.list_image_subject)),
-                (self.constants.TITLE_SCENE, len(self.list_image_scene)),
-                (self.constants.TITLE_STYLE, len(self.list_image_style)),
-            ]
+            category_counts = zip(self._category_titles, self.image_lists.counts())
 
+            extra_inputs = []
             for idx, (title, count) in enumerate(category_counts):
                 logger.debug(f"Section '{title}' has {count} image(s)")
-                extra_inputs = max(count - 1, 0)
-                if extra_inputs == 0:
-                    logger.debug(f"No extra inputs needed for '{title}'")
-                    continue
-
-                if idx >= len(list_btn_add_input):
+                extra_inputs.append(max(count - 1, 0))
+                if extra_inputs[idx] and idx >= len(list_btn_add_input):
                     logger.warning(f"⚠️ Missing 'Add new category' button for section: {title}")
-                    continue
 
-                btn_add_input: nd.Element = list_btn_add_input[idx]
-                logger.debug(f"Using add-category button index {idx} for '{title}'")
-                await btn_add_input.scroll_into_view()
-                await asyncio.sleep(self.constants.SLEEP_BEFORE_SCROLL)
+            if not any(extra_inputs):
+                logger.debug("No extra category inputs needed")
+                return 0
+
+            # Click every section's add-category button the needed number of times in one call
+            clicked = await evaluate_value(
+                tab,
+                self.ADD_CATEGORY_CLICKS_JS % (_ADD_CATEGORY_SELECTOR_JS, json.dumps(extra_inputs)),
+                await_promise=True,
+            )
+            if not isinstance(clicked, list):
+                clicked = []
+            for title, count in zip(self._category_titles, clicked):
+                if count:
+                    logger.debug(f"Added {count} new category input(s) for {title}")
 
-                for _ in range(extra_inputs):
-                    logger.debug(f"Clicking add-category for '{title}' (remaining: {extra_inputs})")
-                    await btn_add_input.mouse_click()
-                    await asyncio.sleep(self.constants.SLEEP_BEFORE_SCROLL)
-                    logger.debug(f"Added new category input for {title}")
+            # Let the page render the new inputs
+            await asyncio.sleep(self.constants.SLEEP_BEFORE_SCROLL)
+            return sum(clicked)
         except Exception as e:
             logger.error(f"Error preparing category inputs: {e}")
+            return 0
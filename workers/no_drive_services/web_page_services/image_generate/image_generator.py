@@ -1,6 +1,7 @@
 """Image generation module for AI image creation and downloading."""
 
 import asyncio
+import json
 from typing import List, TypedDict
 
 import nodriver as nd
@@ -15,8 +16,40 @@ from workers.configs.image_genarator_config import ImageGeneratorConstants
 from workers.no_drive_services.web_page_services.image_generate.dowload_after_generate import DownloadAfterGenerate
 from workers.no_drive_services.web_page_services.image_generate.download_image_local import DownloadImageLocal
 from workers.no_drive_services.web_page_services.image_generate.image_click_upload import ImageClickUpload
+from workers.no_drive_services.web_page_services.image_generate.image_lists import ImageLists
 from workers.no_drive_services.web_page_services.image_generate.image_login import ImageLogin
 from workers.no_drive_services.web_page_services.image_generate.image_upload import ImageUpload
+from workers.no_drive_services.web_page_services.page_script import evaluate_value
+
+# Toggles the aspect ratio menu, clicks the ratio option and closes the menu again,
+# waiting up to timeoutMs for each button; returns an error message or null
+_SET_ASPECT_RATIO_JS = """
+    (async (icon, ratioText, timeoutMs) => {
+        const delay = ms => new Promise(resolve => setTimeout(resolve, ms));
+        const waitForButton = async (tag, text) => {
+            for (let waited = 0; waited <= timeoutMs; waited += 100) {
+                const elem = Array.prototype.find.call(
+                    document.querySelectorAll('button ' + tag),
+                    el => (el.textContent || '').trim() === text
+                );
+                if (elem) return elem.closest('button');
+                await delay(100);
+            }
+            return null;
+        };
+
+        const toggle = await waitForButton('i', icon);
+        if (!toggle) return 'aspect ratio button not found';
+        toggle.click();
+
+        const option = await waitForButton('span', ratioText);
+        if (!option) return 'ratio option not found';
+        option.click();
+
+        toggle.click();
+        return null;
+    })(%s, %s, %d)
+"""
 
 
 class TResultImageGenerate(TypedDict):
@@ -36,33 +69,37 @@ class ImageGenerator:
     def __init__(self):
         self.tab = None
         self.temp_download_dir = None
-        self.list_image_subject = []
-        self.list_image_scene = []
-        self.list_image_style = []
+        # Shared with the download/upload helpers, only mutated in place
+        self.image_lists = ImageLists()
         self.image_login = ImageLogin()
         self.download_image_local = DownloadImageLocal(
             temp_download_dir=self.temp_download_dir,
-            list_image_subject=self.list_image_subject,
-            list_image_scene=self.list_image_scene,
-            list_image_style=self.list_image_style
+            image_lists=self.image_lists,
         )
         self.constants = ImageGeneratorConstants()
+        # ETypeRatioImage value -> label of the ratio option in the Whisk menu
+        self._ratio_map = {
+            ETypeRatioImage.SQUARE.value: self.constants.RATIO_SQUARE,
+            ETypeRatioImage.VERTICAL.value: self.constants.RATIO_VERTICAL,
+            ETypeRatioImage.HORIZONTAL.value: self.constants.RATIO_HORIZONTAL,
+        }
         self.image_upload = ImageUpload(
             constants=self.constants,
-            list_image_subject=self.list_image_subject,
-            list_image_scene=self.list_image_scene,
-            list_image_style=self.list_image_style,
+            image_lists=self.image_lists,
         )
         self.image_click_upload = ImageClickUpload(
             constants=self.constants,
-            list_image_subject=self.list_image_subject,
-            list_image_scene=self.list_image_scene,
-            list_image_style=self.list_image_style,
+            image_lists=self.image_lists,
         )
         self.download_after_generate = DownloadAfterGenerate(
             constants=self.constants,
         )
 
+    def reset(self):
+        """Clear per-task state so the generator can be reused for the next task."""
+        self.tab = None
+        self.image_lists.clear()
+
     async def execute_image_generate(
             self,
             tab: nd.Tab,
@@ -91,17 +128,12 @@ class ImageGenerator:
 
             logger.info("Step 5: Generate and download images for each prompt")
             # Generate and download images for each prompt
-            for idx, prompt in enumerate(list_prompt):
-                logger.info(f"Processing prompt {idx + 1}/{len(list_prompt)}")
-
-                await self._generate(tab=tab, prompt=prompt)
-                if await self.download_after_generate.download(
-                        tab=tab,
-                        account_email=account_email.email,
-                        current_page=idx,
-                        total_inputs=count_upload,
-                ):
-                    await asyncio.sleep(self.constants.SLEEP_AFTER_GENERATION_CHECK)
+            await self._generate_and_download_all(
+                tab=tab,
+                list_prompt=list_prompt,
+                account_email=account_email.email,
+                total_inputs=count_upload,
+            )
 
             logger.info("Step 6: Create result")
             result = self._create_result(task_image)
@@ -117,25 +149,21 @@ class ImageGenerator:
 
     @staticmethod
     def _prepare_prompt_list(task_image: TaskAIImageVoiceCanvaInstagram) -> List[str]:
-        list_prompt = [
-            task_image.promptThumbInput,
-            task_image.promptPage1Input,
-            task_image.promptPage2Input,
-        ]
-
-        # Add niche prompts if they're not URLs
-        niche_prompts = [
+        # Niche inputs hold either a prompt or a reference image URL; only prompts are generated
+        niche_prompts = (
             task_image.promptNichePage3Input,
             task_image.promptNichePage4Input,
             task_image.promptNichePage5Input,
+        )
+        return [
+            task_image.promptThumbInput,
+            task_image.promptPage1Input,
+            task_image.promptPage2Input,
+        ] + [
+            prompt for prompt in niche_prompts
+            if prompt and not prompt.startswith(("http://", "https://"))
         ]
 
-        for prompt in niche_prompts:
-            if prompt and "http" not in prompt:
-                list_prompt.append(prompt)
-
-        return list_prompt
-
     async def _setup_generate(
             self,
             ratio_image: str,
@@ -176,45 +204,64 @@ class ImageGenerator:
         )
 
     async def _set_aspect_ratio(self, ratio_image: str):
-        logger.info(f"Setting aspect ratio to: {ratio_image}")
+        """
+        Open the aspect ratio menu, pick the ratio and close the menu in one page script.
 
-        # Open aspect ratio menu
-        await self._click_aspect_ratio_button()
+        Args:
+            ratio_image: ETypeRatioImage value
+        """
+        logger.info(f"Setting aspect ratio to: {ratio_image}")
 
-        # Select ratio
         ratio_text = self._get_ratio_text(ratio_image)
-        if ratio_text:
-            await UtilActions.click(
-                tab=self.tab,
-                parentTag="button",
-                rootTag="span",
-                text=ratio_text,
-                timeout=self.constants.DEFAULT_TIMEOUT,
-            )
-
-        # Close aspect ratio menu
-        await self._click_aspect_ratio_button()
-
-    async def _click_aspect_ratio_button(self):
-        """Click the aspect ratio button to toggle the menu."""
-        await UtilActions.click(
-            tab=self.tab,
-            parentTag="button",
-            rootTag="i",
-            text=self.constants.BTN_ASPECT_RATIO_ICON,
-            timeout=self.constants.DEFAULT_TIMEOUT,
+        error = await evaluate_value(
+            self.tab,
+            _SET_ASPECT_RATIO_JS % (
+                json.dumps(self.constants.BTN_ASPECT_RATIO_ICON),
+                json.dumps(ratio_text),
+                self.constants.DEFAULT_TIMEOUT * 1000,
+            ),
+            await_promise=True,
         )
+        if isinstance(error, str):
+            raise Exception(f"Failed to set aspect ratio {ratio_text}: {error}")
 
     def _get_ratio_text(self, ratio_image: str) -> str:
-        ratio_map = {
-            ETypeRatioImage.SQUARE.value: self.constants.RATIO_SQUARE,
-            ETypeRatioImage.VERTICAL.value: self.constants.RATIO_VERTICAL,
-            ETypeRatioImage.HORIZONTAL.value: self.constants.RATIO_HORIZONTAL,
-        }
-        return ratio_map.get(ratio_image, self.constants.RATIO_SQUARE)
+        return self._ratio_map.get(ratio_image, self.constants.RATIO_SQUARE)
 
-    async def _generate(self, tab: nd.Tab, prompt: str):
-        logger.info(f"🎨 Generating image with prompt: {prompt[:50]}...")
+    async def _generate_and_download_all(
+            self,
+            tab: nd.Tab,
+            list_prompt: List[str],
+            account_email: str,
+            total_inputs: int,
+    ):
+        """
+        Generate and download one image per prompt, strictly one after another.
+
+        The next prompt is only typed once the current image was downloaded, since
+        Whisk may read or reset the prompt textarea while a generation is running.
+
+        Args:
+            tab: Browser tab instance
+            list_prompt: Prompts in page order
+            account_email: Email for directory organization
+            total_inputs: Number of uploaded input images
+        """
+        for idx, prompt in enumerate(list_prompt):
+            logger.info(f"Processing prompt {idx + 1}/{len(list_prompt)}")
+
+            await self._fill_prompt(tab=tab, prompt=prompt)
+            await self._submit_prompt(tab=tab)
+
+            await self.download_after_generate.download(
+                tab=tab,
+                account_email=account_email,
+                current_page=idx,
+                total_inputs=total_inputs,
+            )
+
+    async def _fill_prompt(self, tab: nd.Tab, prompt: str):
+        logger.info(f"🎨 Entering image prompt: {prompt[:50]}...")
 
         # Enter prompt
         await UtilActions.sendKey(
@@ -226,6 +273,8 @@ class ImageGenerator:
             typeSendKey="human",
             timeout=self.constants.DEFAULT_TIMEOUT,
         )
+
+    async def _submit_prompt(self, tab: nd.Tab):
         logger.info("Submitting prompt")
         await UtilActions.click(
             tab=tab,
@@ -0,0 +1,48 @@
+"""Reference image paths shared by the Whisk image generation helpers."""
+
+from dataclasses import dataclass, field
+
+from src.enums.EFolderImageAI import EFolderImageAI
+
+
+@dataclass(slots=True)
+class ImageLists:
+    """
+    Local paths of the subject, scene and style images of the current task.
+
+    One instance is shared by ImageGenerator and its helpers; the lists are
+    only ever mutated in place so every helper sees the same images.
+    """
+
+    subject: list[str] = field(default_factory=list)
+    scene: list[str] = field(default_factory=list)
+    style: list[str] = field(default_factory=list)
+
+    def add(self, folder_type: EFolderImageAI, path: str):
+        """
+        Append an image path to the list of its folder type.
+
+        Args:
+            folder_type: Type of folder (SUBJECT, SCENE, STYLE)
+            path: Local image path
+        """
+        if folder_type == EFolderImageAI.SUBJECT:
+            self.subject.append(path)
+        elif folder_type == EFolderImageAI.SCENE:
+            self.scene.append(path)
+        elif folder_type == EFolderImageAI.STYLE:
+            self.style.append(path)
+
+    def all(self) -> list[str]:
+        """Return every image path in page order (subject, scene, style)."""
+        return self.subject + self.scene + self.style
+
+    def counts(self) -> tuple[int, int, int]:
+        """Return the number of subject, scene and style images."""
+        return len(self.subject), len(self.scene), len(self.style)
+
+    def clear(self):
+        """Empty all three lists in place."""
+        self.subject.clear()
+        self.scene.clear()
+        self.style.clear()
@@ -1,31 +1,120 @@
 import asyncio
+from typing import Optional
 
 import nodriver as nd
 from loguru import logger
 
+from workers.no_drive_services.web_page_services.page_script import evaluate_value
+
 
 class ImageLogin:
+    # Current onboarding screen, checked in order since dialogs can overlay the Whisk UI
+    ONBOARDING_STATE_JS = """
+        (() => {
+            const hasButton = (text) => Array.prototype.some.call(
+                document.querySelectorAll('button'),
+                btn => (btn.textContent || '').trim() === text
+            );
+            if (document.querySelector('div[class*="iRBQdk"]')) return 'policy';
+            if (document.querySelector('button#marketing-emails[role="checkbox"]')) return 'consent';
+            if (hasButton('Get started')) return 'get_started';
+            if (hasButton('Continue')) return 'continue';
+            if (document.querySelector('textarea')) return 'ready';
+            return null;
+        })()
+    """
+    # Scrolls the policy box to the bottom and clicks Continue; returns whether it was clicked
+    POLICY_ACCEPT_JS = """
+        (async () => {
+            const policyContainer = document.querySelector('div[class*="iRBQdk"]');
+            if (policyContainer) {
+                policyContainer.scrollTop = policyContainer.scrollHeight;
+            }
+            // Let the page enable Continue after the scroll event
+            await new Promise(resolve => setTimeout(resolve, 200));
+            const button = Array.prototype.find.call(
+                document.querySelectorAll('button'),
+                btn => (btn.textContent || '').trim() === 'Continue' && !btn.disabled
+            );
+            if (!button) return false;
+            button.click();
+            return true;
+        })()
+    """
+    # States reported by ONBOARDING_STATE_JS that have a _step_<state> handler
+    ONBOARDING_STEPS = ("policy", "consent", "get_started", "continue")
+    ONBOARDING_PROBE_TIMEOUT = 5  # seconds
+    ONBOARDING_PROBE_INTERVAL = 0.25  # seconds
+    MAX_ONBOARDING_STEPS = 6
+    CONTINUE_CLICK_TIMEOUTS = (5, 2, 1)  # seconds, one per consecutive Continue screen
+
     def __init__(self):
-        pass
+        # Target ids of tabs that already went through the onboarding clickthrough
+        self._warm_targets: set[str] = set()
 
     async def execute_image_login(
             self,
             tab: nd.Tab,
     ) -> bool:
+        if tab.target_id in self._warm_targets:
+            logger.info("✅ Image Login skipped, tab already onboarded")
+            return True
+
+        # Probe which onboarding screen is shown and only run its step,
+        # instead of waiting out every step's timeout on onboarded accounts
+        for _ in range(self.MAX_ONBOARDING_STEPS):
+            state = await self._wait_onboarding_state(tab)
+            if state not in self.ONBOARDING_STEPS:
+                break
+            logger.debug(f"Image onboarding step: {state}")
+            await getattr(self, f"_step_{state}")(tab)
+
+        logger.info("✅ Image Login success")
+        self._warm_targets.add(tab.target_id)
+
+        await asyncio.sleep(2)
+        return True
+
+    async def _wait_onboarding_state(self, tab: nd.Tab) -> Optional[str]:
+        """
+        Poll the page until a known onboarding screen (or the Whisk UI) is shown.
+
+        Returns:
+            "policy", "consent", "get_started", "continue" or "ready", None if nothing known appeared
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.ONBOARDING_PROBE_TIMEOUT
+        while True:
+            try:
+                state = await evaluate_value(tab, self.ONBOARDING_STATE_JS)
+                if state == "ready" or state in self.ONBOARDING_STEPS:
+                    return state
+            except Exception as e:
+                logger.debug(f"Onboarding state probe failed: {e}")
+            if loop.time() >= deadline:
+                return None
+            await asyncio.sleep(self.ONBOARDING_PROBE_INTERVAL)
+
+    async def _step_continue(self, tab: nd.Tab):
         # Import here to avoid multiprocessing import issues on Windows
         from nodrive_gpm_package.utils import UtilActions
 
-        while True:
+        # Follow-up Continue screens render quickly, so each wait gets shorter
+        for timeout in self.CONTINUE_CLICK_TIMEOUTS:
             try:
                 await UtilActions.click(
                     tab=tab,  # Changed parameter name only
                     rootTag="button",
                     text="Continue",
-                    timeout=5,
+                    timeout=timeout,
                 )
             except:
                 break
 
+    async def _step_get_started(self, tab: nd.Tab):
+        # Import here to avoid multiprocessing import issues on Windows
+        from nodrive_gpm_package.utils import UtilActions
+
         try:
             await UtilActions.click(
                 tab=tab,  # Changed parameter name only
@@ -36,6 +125,10 @@ class ImageLogin:
         except:
             pass
 
+    async def _step_consent(self, tab: nd.Tab):
+        # Import here to avoid multiprocessing import issues on Windows
+        from nodrive_gpm_package.utils import UtilActions
+
         try:
             await UtilActions.click(
                 tab=tab,  # Changed parameter name only
@@ -60,43 +153,19 @@ class ImageLogin:
         except:
             pass
 
-        try:
-            elmBoxPolicy: nd.Element = await UtilActions.getElement(
-                tab=tab,  # Changed parameter name only
-                rootTag="div",
-                attributes={"class": "iRBQdk"},
-                timeout=3,
-            )
-            # Scroll 200px xuống
-            await elmBoxPolicy.apply(
-                """
-                    (div) => {
-                        div.scrollTo({
-                            top: div.scrollTop + 200px,
-                            behavior: 'smooth'
-                        });
-                    }
-                """
-            )
-
-            await tab.evaluate(
-                """
-                    const policyContainer = document.querySelector('div[class*="iRBQdk"]');
-                    if (policyContainer) {
-                        policyContainer.scrollTop = policyContainer.scrollHeight;
-                    }
-                """
-            )
+    async def _step_policy(self, tab: nd.Tab):
+        # Import here to avoid multiprocessing import issues on Windows
+        from nodrive_gpm_package.utils import UtilActions
 
-            await UtilActions.click(
-                tab=tab,  # Changed parameter name only
-                rootTag="button",
-                text="Continue",
-                timeout=10,
-            )
+        try:
+            clicked = await evaluate_value(tab, self.POLICY_ACCEPT_JS, await_promise=True)
+            if clicked is not True:
+                # Continue may only render once the scroll has been handled
+                await UtilActions.click(
+                    tab=tab,  # Changed parameter name only
+                    rootTag="button",
+                    text="Continue",
+                    timeout=10,
+                )
         except:
             pass
-
-        logger.info("✅ Image Login success")
-
-        await asyncio.sleep(2)
@@ -6,19 +6,20 @@ import nodriver as nd
 from loguru import logger
 from nodrive_gpm_package.utils import UtilActions
 
+from workers.no_drive_services.web_page_services.image_generate.image_lists import ImageLists
+
 
 class ImageUpload:
+    # Maximum number of files sent to their inputs at the same time
+    UPLOAD_CONCURRENCY = 4
+
     def __init__(
             self,
             constants,
-            list_image_subject,
-            list_image_scene,
-            list_image_style,
+            image_lists: ImageLists,
     ):
         self.constants = constants
-        self.list_image_subject = list_image_subject
-        self.list_image_scene = list_image_scene
-        self.list_image_style = list_image_style
+        self.image_lists = image_lists
         self.total_images = 0
         self.images = []
 
@@ -26,7 +27,7 @@ class ImageUpload:
             self,
             tab: nd.Tab,
     ):
-        self.images = self.list_image_subject + self.list_image_scene + self.list_image_style
+        self.images = self.image_lists.all()
         self.total_images = len(self.images)
 
         if not self.total_images:
@@ -38,27 +39,35 @@ class ImageUpload:
         logger.info(f'---- Find {len(input_elements)} inputs to upload images ---')
         logger.info(f"📤 Uploading {self.total_images} images")
 
-        # Upload files one by one
-        count_upload = 0
-        while count_upload < self.total_images:
-            if count_upload >= len(input_elements):
-                logger.warning(f"Requested input index {count_upload} out of range (total {len(input_elements)})")
-                logger.warning(f"Image file {count_upload}/{self.total_images} uploaded successfully")
-                break
-
-            file = self.images[count_upload]
-            input_element = input_elements[count_upload]
-            await self._send_file(input_element, file, count_upload)
-            count_upload += 1
+        count_upload = min(self.total_images, len(input_elements))
+        if count_upload < self.total_images:
+            logger.warning(f"Requested input index {count_upload} out of range (total {len(input_elements)})")
+            logger.warning(f"Only {count_upload}/{self.total_images} image files will be uploaded")
+
+        # Each file goes to its own input, so uploads run concurrently (bounded)
+        semaphore = asyncio.Semaphore(self.UPLOAD_CONCURRENCY)
+        await asyncio.gather(*(
+            self._send_file_bounded(semaphore, input_element, file, index)
+            for index, (input_element, file) in enumerate(zip(input_elements, self.images))
+        ))
         return count_upload
 
+    async def _send_file_bounded(
+            self,
+            semaphore: asyncio.Semaphore,
+            input_element: nd.Element,
+            path_file: str,
+            count_upload: int,
+    ):
+        async with semaphore:
+            await self._send_file(input_element, path_file, count_upload)
+
     async def _send_file(
             self,
             input_element: nd.Element,
             path_file: str,
             count_upload: int,
     ):
-        await asyncio.sleep(self.constants.SLEEP_BEFORE_SCROLL)
         await self._scroll_to_section(input_element)
 
         logger.info(f"📤 Uploading file {count_upload + 1}/{self.total_images}:")
@@ -0,0 +1,122 @@
+"""Direct download of generated media (thumbnails, videos, voices) without the browser roundtrip."""
+
+import asyncio
+import base64
+import binascii
+import os
+import shutil
+from typing import Optional
+from urllib.parse import unquote_to_bytes, urlparse
+
+import nodriver as nd
+import requests
+from loguru import logger
+
+# Media MIME type -> file extension
+_CONTENT_TYPE_EXTENSIONS = {
+    "image/png": ".png",
+    "image/jpeg": ".jpg",
+    "image/jpg": ".jpg",
+    "image/gif": ".gif",
+    "image/webp": ".webp",
+    "video/mp4": ".mp4",
+    "video/webm": ".webm",
+    "audio/wav": ".wav",
+    "audio/x-wav": ".wav",
+    "audio/wave": ".wav",
+    "audio/mpeg": ".mp3",
+    "audio/mp3": ".mp3",
+    "audio/ogg": ".ogg",
+}
+
+# Shared so direct downloads reuse pooled connections
+_session = requests.Session()
+
+# Base64 characters decoded per write (a multiple of 4, 48 KiB of output)
+_BASE64_WINDOW = 1 << 16
+
+# Output directories already created in this process
+_ensured_dirs: set[str] = set()
+
+
+async def download_media(
+        tab: nd.Tab,
+        src: str,
+        dir_store: str,
+        name_file: str,
+        default_ext: str,
+) -> Optional[str]:
+    """
+    Save a media src straight from Python when possible.
+
+    http(s) URLs are streamed with the tab's cookies and data: URLs are decoded
+    locally, both on a worker thread. Other sources (blob:) only resolve inside
+    the page and are left to UtilDownloadFile.
+
+    Args:
+        tab: Browser tab the media belongs to
+        src: src attribute of the media element
+        dir_store: Target directory
+        name_file: File name without extension
+        default_ext: Extension used when the MIME type is unknown (e.g. ".mp4")
+
+    Returns:
+        Path of the saved file, None if src must be downloaded through the browser
+    """
+    try:
+        if src.startswith("data:"):
+            return await asyncio.to_thread(_save_data_url, src, dir_store, name_file, default_ext)
+
+        if urlparse(src).scheme in ("http", "https"):
+            cookies = await tab.send(nd.cdp.network.get_cookies(urls=[src]))
+            cookie_jar = {cookie.name: cookie.value for cookie in cookies}
+            return await asyncio.to_thread(_stream_url, src, cookie_jar, dir_store, name_file, default_ext)
+    except Exception as e:
+        logger.warning(f"Direct media download failed, falling back to browser: {e}")
+    return None
+
+
+def _ensure_dir(dir_store: str):
+    """Create dir_store once per process instead of on every download."""
+    if dir_store not in _ensured_dirs:
+        os.makedirs(dir_store, exist_ok=True)
+        _ensured_dirs.add(dir_store)
+
+
+def _extension(mime_type: str, fallback: str) -> str:
+    return _CONTENT_TYPE_EXTENSIONS.get(mime_type.split(";", 1)[0].strip().lower()) or fallback
+
+
+def _save_data_url(src: str, dir_store: str, name_file: str, default_ext: str) -> str:
+    """Decode a data: URL to a file."""
+    header, _, payload = src.partition(",")
+    params = header[len("data:"):].split(";")
+
+    _ensure_dir(dir_store)
+    file_path = os.path.join(dir_store, f"{name_file}{_extension(params[0], default_ext)}")
+    with open(file_path, "wb") as f:
+        if params[-1] != "base64":
+            f.write(unquote_to_bytes(payload))
+        elif len(payload) % 4:
+            # Unpadded payload, let b64decode handle it in one go
+            f.write(base64.b64decode(payload + "=" * (-len(payload) % 4)))
+        else:
+            # Decode window by window so the full decoded blob is never held in memory
+            for start in range(0, len(payload), _BASE64_WINDOW):
+                f.write(binascii.a2b_base64(payload[start:start + _BASE64_WINDOW]))
+    return file_path
+
+
+def _stream_url(url: str, cookie_jar: dict, dir_store: str, name_file: str, default_ext: str) -> str:
+    """Stream an http(s) URL to a file."""
+    with _session.get(url, cookies=cookie_jar, stream=True, timeout=60) as response:
+        response.raise_for_status()
+        fallback = os.path.splitext(urlparse(url).path)[1] or default_ext
+        ext = _extension(response.headers.get("Content-Type", ""), fallback)
+
+        _ensure_dir(dir_store)
+        file_path = os.path.join(dir_store, f"{name_file}{ext}")
+        response.raw.decode_content = True
+        with open(file_path, "wb") as f:
+            shutil.copyfileobj(response.raw, f, length=1 << 16)
+    return file_path
@@ -0,0 +1,34 @@
+"""Evaluation of page scripts that return plain JSON values."""
+
+from typing import Any
+
+import nodriver as nd
+
+
+async def evaluate_value(tab: nd.Tab, expression: str, await_promise: bool = False) -> Any:
+    """
+    Evaluate a page script and return its result as a plain Python value.
+
+    Tab.evaluate hands back the raw RemoteObject instead of the value when the
+    script returns a falsy value (null, false, 0, '', []), and the
+    ExceptionDetails when the script throws. Both are truthy, so callers must
+    not test its result directly; this helper unwraps them.
+
+    Args:
+        tab: Browser tab
+        expression: Script to evaluate, resolving to a JSON-serializable value
+        await_promise: Whether to wait for a returned promise to settle
+
+    Returns:
+        The script result (None for null/undefined)
+
+    Raises:
+        RuntimeError: If the script threw
+    """
+    result = await tab.evaluate(expression, await_promise=await_promise, return_by_value=True)
+    if isinstance(result, nd.cdp.runtime.ExceptionDetails):
+        description = result.exception.description if result.exception else None
+        raise RuntimeError(f"Page script failed: {description or result.text}")
+    if isinstance(result, nd.cdp.runtime.RemoteObject):
+        return result.value
+    return result
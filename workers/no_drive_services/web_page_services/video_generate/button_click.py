@@ -0,0 +1,72 @@
+import json
+
+import nodriver as nd
+from loguru import logger
+from nodrive_gpm_package.utils import UtilActions
+
+from workers.no_drive_services.web_page_services.page_script import evaluate_value
+
+# Returns a stable CSS selector (id or aria-label) for the first button whose text
+# contains the given text, or null when the button is missing or has no stable attribute
+_STABLE_BUTTON_SELECTOR_JS = """
+    ((text) => {
+        const button = Array.prototype.find.call(
+            document.querySelectorAll('button'),
+            btn => (btn.textContent || '').includes(text)
+        );
+        if (!button) return null;
+        if (button.id) return 'button#' + CSS.escape(button.id);
+        const label = button.getAttribute('aria-label');
+        if (label) return 'button[aria-label="' + label.replace(/["\\\\]/g, '\\\\$&') + '"]';
+        return null;
+    })(%s)
+"""
+
+# Logical button name -> CSS selector resolved from its text on an earlier click
+_selector_cache: dict[str, str] = {}
+
+
+async def click_button(tab: nd.Tab, name: str, text: str, timeout: int = 10):
+    """
+    Click a Flow button by text, reusing a CSS selector resolved on an earlier click.
+
+    The first click resolves the button's id/aria-label selector; later clicks
+    (across tasks in this process) select it directly instead of scanning every
+    button's text. Falls back to the text-based UtilActions.click.
+
+    Args:
+        tab: Browser tab
+        name: Logical button name, used as the cache key
+        text: Text contained in the button (icon ligatures like "add_2" included)
+        timeout: Seconds to wait for the button
+
+    Raises:
+        Exception: If the button cannot be found or clicked
+    """
+    selector = _selector_cache.get(name)
+    if selector is None:
+        try:
+            selector = await evaluate_value(tab, _STABLE_BUTTON_SELECTOR_JS % json.dumps(text))
+        except Exception as e:
+            logger.debug(f"Could not resolve selector for '{name}': {e}")
+            selector = None
+        if not isinstance(selector, str) or not selector:
+            selector = None
+        else:
+            _selector_cache[name] = selector
+
+    if selector:
+        try:
+            button = await tab.select(selector, timeout=timeout)
+            await button.click()
+            return
+        except Exception as e:
+            logger.debug(f"Cached selector for '{name}' failed, clicking by text: {e}")
+            _selector_cache.pop(name, None)
+
+    await UtilActions.click(
+        tab=tab,
+        rootTag="button",
+        text=text,
+        timeout=timeout,
+    )
@@ -1,43 +1,77 @@
+import asyncio
 from asyncio import sleep as asyncio_sleep
 
-import nodriver as nd
 from loguru import logger
 from nodrive_gpm_package.utils import UtilActions
-from nodrive_gpm_package.utils import UtilDownloadFile
+
+from workers.no_drive_services.web_page_services.page_script import evaluate_value
+from workers.no_drive_services.web_page_services.video_generate.button_click import click_button
 
 
 class CreateNewProject:
+    # True once the Flow landing page shows either 'Get started' or the new project button
+    LANDING_READY_JS = """
+        (() => Array.prototype.some.call(
+            document.querySelectorAll('button'),
+            btn => {
+                const text = btn.textContent || '';
+                return text.includes('Get started') || text.includes('add_2');
+            }
+        ))()
+    """
+    LANDING_READY_TIMEOUT = 8  # seconds
+    LANDING_READY_INTERVAL = 0.25  # seconds
+    PROMPT_INPUT_SELECTOR = "textarea#PINHOLE_TEXT_AREA_ELEMENT_ID"
+
     def __init__(self, tab):
         self.tab = tab
 
-    async def execute_create_new_project(self):
+    async def wait_for_landing_page(self):
+        """Wait until the Flow landing page is interactive, instead of a fixed sleep after navigation."""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.LANDING_READY_TIMEOUT
+        while loop.time() < deadline:
+            try:
+                if await evaluate_value(self.tab, self.LANDING_READY_JS):
+                    return
+            except Exception as e:
+                logger.debug(f"Landing page probe failed: {e}")
+            await asyncio_sleep(self.LANDING_READY_INTERVAL)
+        logger.warning(f"Flow landing page not ready after {self.LANDING_READY_TIMEOUT}s, continuing")
+
+    async def execute_create_new_project(self, check_get_started: bool = True):
         """
         Create a new project by clicking the 'Get started' and 'add_x' buttons,
         using UtilActions.click instead of the unavailable query_element.
+
+        Args:
+            check_get_started: Probe for the one-time 'Get started' onboarding button first
         """
         # Click "Get started" if the button is visible
-        try:
-            logger.info("Checking if 'Get started' button is visible...")
-            await UtilActions.click(
-                tab=self.tab,
-                rootTag="button",
-                text="Get started",
-                timeout=2,
-            )
-            logger.info("Clicked 'Get started' button")
-            await asyncio_sleep(2)
-        except Exception as e:
-            logger.warning(f"Could not find or click 'Get started' button: {e}")
+        if check_get_started:
+            try:
+                logger.info("Checking if 'Get started' button is visible...")
+                await UtilActions.click(
+                    tab=self.tab,
+                    rootTag="button",
+                    text="Get started",
+                    timeout=2,
+                )
+                # The add_2 click below waits for the next screen itself
+                logger.info("Clicked 'Get started' button")
+            except Exception as e:
+                logger.warning(f"Could not find or click 'Get started' button: {e}")
 
         logger.info("Creating new project...")
         try:
-            # Locate and click the "add_2" button using UtilActions.click
-            await UtilActions.click(
-                tab=self.tab,
-                rootTag="button",
-                text="add_2",
-                timeout=10,
-            )
-            await asyncio_sleep(3)
+            # Locate and click the "add_2" button
+            await click_button(self.tab, "new_project", "add_2", timeout=10)
         except Exception as e:
             logger.error(f"Exception while trying to find or click 'add_2' button: {e}")
+            return
+
+        # The project is ready once its prompt input exists
+        try:
+            await self.tab.wait_for(selector=self.PROMPT_INPUT_SELECTOR, timeout=10)
+        except asyncio.TimeoutError:
+            logger.warning("Prompt input did not appear after creating the project")
@@ -1,93 +1,102 @@
 import os
 import uuid
 from asyncio import sleep as asyncio_sleep
-from typing import Optional
+from typing import Callable, Optional
 
-import nodriver as nd
 from loguru import logger
 from nodrive_gpm_package.utils import UtilActions
 from nodrive_gpm_package.utils import UtilDownloadFile
 
+from workers.no_drive_services.web_page_services.media_download import download_media
+from workers.no_drive_services.web_page_services.video_generate.generation_watch import (
+    css_attribute_value,
+    race_lookups,
+    wait_for_generation,
+)
+
+_GENERATED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "generated")
+
 
 class DownloadThumb:
-    def __init__(self, tab, account, src, prompt):
+    def __init__(self, tab, account, get_cached_src: Callable[[], Optional[str]]):
         self.tab = tab
         self.account_email = account
-        self._last_thumbnail_src = src
-        self._last_thumbnail_prompt = prompt
+        self.dir_store = os.path.join(_GENERATED_DIR, "thumbnails", account)
+        # Reads the src cached by the caller from the last wait, on every download
+        self.get_cached_src = get_cached_src
+
+    async def execute_wait_for_thumbnail_to_generate(self, prompt: str) -> Optional[str]:
+        """
+        Wait until the thumbnail of prompt is generated.
 
-    async def execute_wait_for_thumbnail_to_generate(self, prompt: str):
+        Returns:
+            src of the generated thumbnail, None if the generation failed
+        """
         logger.info("Waiting for thumbnail to generate... (waiting for <img> tag)")
-        thumbnail_found = False
-        while not thumbnail_found:
-            try:
-                thumbnail_elem = await UtilActions.getElement(
-                    tab=self.tab,
-                    rootTag="img",
-                    attributes={"alt": f"Flow Image: {prompt}"},
-                    timeout=2,
-                )
-                if thumbnail_elem:
-                    logger.info("Thumbnail generation complete. <img> element appeared.")
-                    # Cache for later download step
-                    try:
-                        self._last_thumbnail_src = thumbnail_elem.attrs.get("src")
-                        self._last_thumbnail_prompt = prompt
-                    except Exception as cache_err:
-                        logger.warning(f"Failed to cache thumbnail src: {cache_err}")
-                    thumbnail_found = True
-                    await asyncio_sleep(2)
-                    break
-            except Exception as e:
-                try:
-                    fail_text_elem = await UtilActions.getElement(
-                        tab=self.tab,
-                        rootTag="div",
-                        parentTag="div",
-                        parentAttributes={"data-testid": "virtuoso-item-list"},
-                        text="Failed to generate",
-                        timeout=1,
-                    )
-                    if fail_text_elem:
-                        logger.error("❌ Thumbnail generation failed: 'Failed to generate' message detected.")
-                        break
-                except Exception as e2:
-                    logger.warning(f"Waiting for <img> element: {e2}")
-                    await asyncio_sleep(1)
+        # Wait for the src too, so the download can start right away
+        selector = f'img[alt="Flow Image: {css_attribute_value(prompt)}"][src]'
+        try:
+            result = await wait_for_generation(self.tab, selector)
+        except Exception as e:
+            logger.warning(f"Thumbnail watcher failed, falling back to polling: {e}")
+            return await self._poll_for_thumbnail(prompt)
 
-    async def execute_download_thumbnail(self, prompt: str) -> Optional[str]:
-        src_thumbnail_url = getattr(self, "_last_thumbnail_src", None)
+        if result["status"] == "failed":
+            logger.error("❌ Thumbnail generation failed: 'Failed to generate' message detected.")
+            return None
+        if result["status"] != "done":  # Timed out, already logged
+            return None
 
-        # Fallback: try to locate the image again by alt text if cache is missing
-        if not src_thumbnail_url:
-            thumbnail_elems: list[nd.Element] = await UtilActions.getElement(
+        logger.info("Thumbnail generation complete. <img> element appeared.")
+        return result["src"]
+
+    async def _poll_for_thumbnail(self, prompt: str) -> Optional[str]:
+        # Direct CSS attribute match instead of filtering every <img> by alt
+        selector = f'img[alt="Flow Image: {css_attribute_value(prompt)}"]'
+        found, thumbnail_elem = await race_lookups(
+            lambda: self.tab.select(selector, timeout=2),
+            lambda: UtilActions.getElement(
                 tab=self.tab,
-                rootTag="img",
-                attributes={"alt": f"Flow Image: {prompt}"},
-                timeout=10,
-            )
-            thumbnail_elem = thumbnail_elems[0] if thumbnail_elems else None
-            if not thumbnail_elem:
-                logger.error(f"❌ No thumbnail element found for prompt: {prompt}")
-                return None
+                rootTag="div",
+                parentTag="div",
+                parentAttributes={"data-testid": "virtuoso-item-list"},
+                text="Failed to generate",
+                timeout=2,
+            ),
+        )
+        if not found:
+            logger.error("❌ Thumbnail generation failed or timed out")
+            return None
+
+        logger.info("Thumbnail generation complete. <img> element appeared.")
+        try:
+            thumbnail_src = thumbnail_elem.attrs.get("src")
+        except Exception as cache_err:
+            logger.warning(f"Failed to cache thumbnail src: {cache_err}")
+            return None
+        await asyncio_sleep(2)
+        return thumbnail_src
 
-            src_thumbnail_url = thumbnail_elem.attrs.get("src")
+    async def execute_download_thumbnail(self, prompt: str) -> Optional[str]:
+        src_thumbnail_url = self.get_cached_src()
 
-        name_file = f"thumbnail_{uuid.uuid4()}"
+        # The wait step caches the src on success, so a missing src means it failed
+        if not src_thumbnail_url:
+            logger.error(f"❌ No generated thumbnail for prompt: {prompt}")
+            return None
+
+        name_file = f"thumbnail_{uuid.uuid4().hex}"
 
         try:
-            current_file_path = os.path.abspath(__file__)
-            current_dir = os.path.dirname(current_file_path)
-            account_dir = self.account_email
-
-            dir_store = os.path.join(current_dir, "generated", "thumbnails", account_dir)
-
-            file_path = await UtilDownloadFile.download(
-                self.tab,
-                src_thumbnail_url,
-                dir_store,
-                name_file,
-            )
+            file_path = await download_media(self.tab, src_thumbnail_url, self.dir_store, name_file, ".jpg")
+            # blob: URLs only resolve inside the page
+            if not file_path:
+                file_path = await UtilDownloadFile.download(
+                    self.tab,
+                    src_thumbnail_url,
+                    self.dir_store,
+                    name_file,
+                )
             logger.info(f"✅ Successfully downloaded: {file_path}")
             return file_path
         except Exception as e:
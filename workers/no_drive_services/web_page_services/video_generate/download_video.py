@@ -8,67 +8,83 @@ from loguru import logger
 from nodrive_gpm_package.utils import UtilActions
 from nodrive_gpm_package.utils import UtilDownloadFile
 
+from workers.no_drive_services.web_page_services.media_download import download_media
+from workers.no_drive_services.web_page_services.video_generate.generation_watch import race_lookups, wait_for_generation
+
+_GENERATED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "generated")
+
 
 class DownloadVideo:
     def __init__(self, tab, account):
         self.tab = tab
         self.account_email = account
+        self.dir_store = os.path.join(_GENERATED_DIR, "videos", account)
+        # src reported by the generation watcher, saves looking the <video> up again
+        self._last_video_src: Optional[str] = None
 
     async def execute_wait_for_video_to_generate(self):
         logger.info("Waiting for video to generate... (waiting for <video> tag)")
-        video_found = False
-        while not video_found:
-            try:
-                video_elem = await UtilActions.getElement(
-                    tab=self.tab,
-                    rootTag="video",
-                    timeout=2,
-                )
-                if video_elem:
-                    logger.info("Video generation complete. <video> element appeared.")
-                    video_found = True
-                    await asyncio_sleep(2)
-                    break
-            except Exception as e:
-                # Check for failed generation message on the page
-                try:
-                    fail_text_elem = await UtilActions.getElement(
-                        tab=self.tab,
-                        rootTag="div",
-                        parentTag="div",
-                        parentAttributes={"data-testid": "virtuoso-item-list"},
-                        text="Failed to generate",
-                        timeout=1,
-                    )
-                    if fail_text_elem:
-                        logger.error("❌ Video generation failed: 'Failed to generate' message detected.")
-                        break
-                except Exception as e2:
-                    logger.warning(f"Waiting for <video> element: {e2}")
-                    await asyncio_sleep(1)
+        try:
+            # Wait for the src too, so the download can start right away
+            result = await wait_for_generation(self.tab, "video[src]")
+        except Exception as e:
+            logger.warning(f"Video watcher failed, falling back to polling: {e}")
+            await self._poll_for_video()
+            return
 
-    async def execute_download_video(self) -> Optional[str]:
-        video_elem: nd.Element = await UtilActions.getElement(
-            tab=self.tab,
-            rootTag="video",
-            timeout=10,
-        )
-        src_video_url = video_elem.attrs.get("src")  # Base 64
-        name_file = f"video_{uuid.uuid4()}"
+        if result["status"] == "failed":
+            logger.error("❌ Video generation failed: 'Failed to generate' message detected.")
+            return
+        if result["status"] != "done":  # Timed out, already logged
+            return
 
-        try:
-            current_file_path = os.path.abspath(__file__)
-            current_dir = os.path.dirname(current_file_path)
-            account_dir = self.account_email
+        logger.info("Video generation complete. <video> element appeared.")
+        self._last_video_src = result["src"]
+
+    async def _poll_for_video(self):
+        found, _ = await race_lookups(
+            lambda: UtilActions.getElement(
+                tab=self.tab,
+                rootTag="video",
+                timeout=2,
+            ),
+            lambda: UtilActions.getElement(
+                tab=self.tab,
+                rootTag="div",
+                parentTag="div",
+                parentAttributes={"data-testid": "virtuoso-item-list"},
+                text="Failed to generate",
+                timeout=2,
+            ),
+        )
+        if not found:
+            logger.error("❌ Video generation failed or timed out")
+            return
 
-            dir_store = os.path.join(current_dir, "generated", "videos", account_dir)
+        logger.info("Video generation complete. <video> element appeared.")
+        await asyncio_sleep(2)
 
-            file_path = await UtilDownloadFile.download(
-                self.tab,
-                src_video_url,
-                dir_store,
-                name_file,
+    async def execute_download_video(self) -> Optional[str]:
+        src_video_url = self._last_video_src  # Base 64
+        if not src_video_url:
+            video_elem: nd.Element = await UtilActions.getElement(
+                tab=self.tab,
+                rootTag="video",
+                timeout=10,
             )
+            src_video_url = video_elem.attrs.get("src")
+        name_file = f"video_{uuid.uuid4().hex}"
+
+        try:
+            file_path = await download_media(self.tab, src_video_url, self.dir_store, name_file, ".mp4")
+            # blob: URLs only resolve inside the page
+            if not file_path:
+                file_path = await UtilDownloadFile.download(
+                    self.tab,
+                    src_video_url,
+                    self.dir_store,
+                    name_file,
+                )
             logger.info(f"✅ Successfully downloaded: {file_path}")
             return file_path
         except Exception as e:
@@ -1,3 +1,4 @@
+import json
 from asyncio import sleep as asyncio_sleep
 
 import nodriver as nd
@@ -5,8 +6,36 @@ from loguru import logger
 from nodrive_gpm_package.utils import UtilActions
 from nodrive_gpm_package.utils import UtilDownloadFile
 
+from workers.no_drive_services.web_page_services.page_script import evaluate_value
+from workers.no_drive_services.web_page_services.video_generate.button_click import click_button
+
 
 class FillPrompt:
+    # Clicks the mode buttons of the role=group toolbar in order within one evaluate,
+    # waiting up to 10s for each; returns the label of the first missing button, or null
+    CLICK_MODE_BUTTONS_JS = """
+        (async (labels) => {
+            const delay = ms => new Promise(resolve => setTimeout(resolve, ms));
+            const findButton = label => Array.prototype.find.call(
+                document.querySelectorAll('div[role="group"] button'),
+                btn => (btn.textContent || '').includes(label)
+            );
+            for (const label of labels) {
+                let button = findButton(label);
+                for (let waited = 0; !button && waited < 10000; waited += 100) {
+                    await delay(100);
+                    button = findButton(label);
+                }
+                if (!button) return label;
+                button.click();
+                await delay(100);
+            }
+            return null;
+        })(%s)
+    """
+
+    PROMPT_INPUT_SELECTOR = "textarea#PINHOLE_TEXT_AREA_ELEMENT_ID"
+
     def __init__(self, tab):
         self.tab = tab
 
@@ -20,59 +49,65 @@ class FillPrompt:
                 text="videocam",
                 timeout=10,
             )
-            await asyncio_sleep(1)
             logger.info("Clicked video button")
         elif type_prompt == "thumbnail":
-            await UtilActions.click(
-                tab=self.tab,
-                rootTag="button",
-                parentTag="div",
-                parentAttributes={"role": "group"},
-                text="image",
-                timeout=10,
-            )
-            await asyncio_sleep(1)
-            await UtilActions.click(
-                tab=self.tab,
-                rootTag="button",
-                parentTag="div",
-                parentAttributes={"role": "group"},
-                text="videocam",
-                timeout=10,
-            )
-            await UtilActions.click(
-                tab=self.tab,
-                rootTag="button",
-                parentTag="div",
-                parentAttributes={"role": "group"},
-                text="image",
-                timeout=10,
-            )
+            labels = ["image", "videocam", "image"]
+            try:
+                missing = await evaluate_value(
+                    self.tab,
+                    self.CLICK_MODE_BUTTONS_JS % json.dumps(labels),
+                    await_promise=True,
+                )
+            except Exception as e:
+                logger.warning(f"Batched mode button clicks failed, clicking one by one: {e}")
+                await self._click_mode_buttons(labels)
+                missing = None
+            if isinstance(missing, str):
+                raise Exception(f"Mode button not found: {missing}")
             logger.info("Clicked thumbnail button")
 
         logger.info("Filling prompt to input...")
         try:
-            await UtilActions.sendKey(
-                tab=self.tab,
-                rootTag="textarea",
-                attributes={'id': 'PINHOLE_TEXT_AREA_ELEMENT_ID'},
-                contentInput=prompt,
-                typeSendKey="human",
-                # typeSendKey="fast",
-                # timeDelay=1,
-                # timeDelayAction=1,
-                timeout=10,
-            )
-            await asyncio_sleep(2)
+            try:
+                await self._insert_prompt(prompt)
+            except Exception as e:
+                logger.warning(f"Prompt insertText failed, typing it instead: {e}")
+                await UtilActions.sendKey(
+                    tab=self.tab,
+                    rootTag="textarea",
+                    attributes={'id': 'PINHOLE_TEXT_AREA_ELEMENT_ID'},
+                    contentInput=prompt,
+                    typeSendKey="fast",
+                    timeout=10,
+                )
+            # Yield so the typed value is flushed before the generate click
+            await asyncio_sleep(0)
         except Exception as e:
             logger.error(f"Error while filling prompt to input: {e}")
             raise
 
+    async def _insert_prompt(self, prompt: str):
+        """
+        Replace the prompt textarea value with one CDP Input.insertText call instead of per-key events.
+
+        Args:
+            prompt: Prompt text
+        """
+        textarea: nd.Element = await self.tab.select(self.PROMPT_INPUT_SELECTOR, timeout=10)
+        await textarea.clear_input()
+        await textarea.focus()
+        await self.tab.send(nd.cdp.input_.insert_text(text=prompt))
+
+    async def _click_mode_buttons(self, labels: list[str]):
+        for label in labels:
+            await UtilActions.click(
+                tab=self.tab,
+                rootTag="button",
+                parentTag="div",
+                parentAttributes={"role": "group"},
+                text=label,
+                timeout=10,
+            )
+
     async def click_generate_button(self):
-        await UtilActions.click(
-            tab=self.tab,
-            rootTag="button",
-            text="arrow_forward",
-            timeout=10,
-        )
-        await asyncio_sleep(2)
+        await click_button(self.tab, "generate", "arrow_forward", timeout=10)
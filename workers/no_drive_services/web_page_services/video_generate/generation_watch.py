@@ -0,0 +1,161 @@
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+import nodriver as nd
+from loguru import logger
+
+from workers.no_drive_services.web_page_services.page_script import evaluate_value
+
+# Resolves as soon as the result element appears or Flow reports a failure,
+# driven by a MutationObserver instead of repeated CDP queries.
+_WATCH_GENERATION_JS = """
+    new Promise(resolve => {
+        const selector = %s;
+        const check = () => {
+            const elem = document.querySelector(selector);
+            if (elem) {
+                return { status: 'done', src: elem.getAttribute('src') };
+            }
+            const list = document.querySelector('div[data-testid="virtuoso-item-list"]');
+            if (list && list.innerText.includes('Failed to generate')) {
+                return { status: 'failed', src: null };
+            }
+            return null;
+        };
+
+        const initial = check();
+        if (initial) {
+            resolve(initial);
+            return;
+        }
+
+        let timer = null;
+        const observer = new MutationObserver(() => {
+            const result = check();
+            if (result) {
+                observer.disconnect();
+                clearTimeout(timer);
+                resolve(result);
+            }
+        });
+        timer = setTimeout(() => {
+            observer.disconnect();
+            resolve({ status: 'timeout', src: null });
+        }, %d);
+        // src may be set after the element is inserted, so watch it as well
+        observer.observe(document.body, {
+            childList: true, subtree: true, characterData: true,
+            attributes: true, attributeFilter: ['src'],
+        });
+    })
+"""
+
+
+# Upper bound for one Flow generation, so a result that never shows cannot hang the task
+MAX_GENERATION_SECONDS = 600
+
+
+def css_attribute_value(value: str) -> str:
+    """
+    Escape a value for use inside a double-quoted CSS attribute selector.
+
+    Backslashes and quotes are backslash-escaped; control characters (e.g. newlines
+    in a prompt) cannot appear literally in a CSS string and become hex escapes.
+    """
+    escaped = []
+    for char in value:
+        if char in ('\\', '"'):
+            escaped.append("\\" + char)
+        elif char < " " or char == "\x7f":
+            escaped.append(f"\\{ord(char):x} ")
+        else:
+            escaped.append(char)
+    return "".join(escaped)
+
+
+async def wait_for_generation(
+        tab: nd.Tab,
+        selector: str,
+        watch_timeout_ms: int = 60000,
+        timeout: float = MAX_GENERATION_SECONDS,
+) -> dict:
+    """
+    Wait until an element matching selector appears or a generation failure is shown.
+
+    Each evaluate call keeps one MutationObserver subscription open for at most
+    watch_timeout_ms; it is re-armed until the generation finishes either way,
+    or until timeout has passed in total.
+
+    Args:
+        tab: Browser tab
+        selector: CSS selector of the generated result element
+        watch_timeout_ms: Lifetime of one observer subscription (milliseconds)
+        timeout: Overall time to wait for the generation (seconds)
+
+    Returns:
+        {"status": "done", "src": <src attribute>}, {"status": "failed", "src": None}
+        or {"status": "timeout", "src": None} once timeout has passed
+
+    Raises:
+        Exception: If the page script cannot be evaluated
+    """
+    expression = _WATCH_GENERATION_JS % (json.dumps(selector), watch_timeout_ms)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        result = await evaluate_value(tab, expression, await_promise=True)
+        if not isinstance(result, dict):
+            raise RuntimeError(f"Unexpected generation watch result: {result!r}")
+        if result.get("status") != "timeout":
+            return result
+        if loop.time() >= deadline:
+            logger.error(f"❌ No generation result after {timeout:.0f}s, giving up waiting")
+            return result
+        logger.debug("Still waiting for {}...", selector)
+
+
+async def race_lookups(
+        find_result: Callable[[], Awaitable[Any]],
+        find_failure: Callable[[], Awaitable[Any]],
+        timeout: float = MAX_GENERATION_SECONDS,
+) -> Tuple[bool, Optional[Any]]:
+    """
+    Run the result and failure element lookups concurrently until one finds its element.
+
+    Lookups that time out (raise) are simply restarted, so neither condition
+    waits for the other's timeout as in an alternating poll.
+
+    Args:
+        find_result: Factory of the lookup for the generated result element
+        find_failure: Factory of the lookup for the 'Failed to generate' message
+        timeout: Overall time to keep looking (seconds)
+
+    Returns:
+        (True, result element) when the result appeared, (False, None) on failure or timeout
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        result_task = asyncio.create_task(find_result())
+        failure_task = asyncio.create_task(find_failure())
+        pending = {result_task, failure_task}
+        try:
+            while pending:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    logger.error(f"❌ No generation result after {timeout:.0f}s, giving up waiting")
+                    return False, None
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=remaining,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                if result_task in done and not result_task.exception() and result_task.result():
+                    return True, result_task.result()
+                if failure_task in done and not failure_task.exception() and failure_task.result():
+                    return False, None
+        finally:
+            for task in pending:
+                task.cancel()
+        logger.debug("Still waiting for generation result...")
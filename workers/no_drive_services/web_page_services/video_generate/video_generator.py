@@ -1,4 +1,3 @@
-from asyncio import sleep as asyncio_sleep
 from typing import Optional
 
 import nodriver as nd
@@ -23,6 +22,17 @@ class VideoGenerator:
         # Cache for last generated thumbnail so we can reliably download it
         self._last_thumbnail_src: Optional[str] = None
         self._last_thumbnail_prompt: Optional[str] = None
+        # The Flow 'Get started' onboarding only shows once per browser profile,
+        # so it is kept across tasks (not cleared in reset)
+        self._onboarding_checked = False
+
+    def reset(self):
+        """Clear per-task state so the generator can be reused for the next task."""
+        self.tab = None
+        self.task = None
+        self.account_email = None
+        self._last_thumbnail_src = None
+        self._last_thumbnail_prompt = None
 
     async def execute_video_generate(
             self,
@@ -36,7 +46,7 @@ class VideoGenerator:
 
         new_project = CreateNewProject(tab)
         fill_prompt = FillPrompt(tab)
-        down_thumb = DownloadThumb(tab, self.account_email, self._last_thumbnail_src, self._last_thumbnail_prompt)
+        down_thumb = DownloadThumb(tab, self.account_email, lambda: self._last_thumbnail_src)
         down_video = DownloadVideo(tab, self.account_email)
 
         prompt_flow_inputs = getattr(self.task, "promptFlowInputs", None)
@@ -52,11 +62,11 @@ class VideoGenerator:
                     continue
 
                 await self.tab.get(self.flow_url)
-
-                await asyncio_sleep(5)
+                await new_project.wait_for_landing_page()
 
                 logger.info("Step 1: Create new project")
-                await new_project.execute_create_new_project()
+                await new_project.execute_create_new_project(check_get_started=not self._onboarding_checked)
+                self._onboarding_checked = True
 
                 logger.info("Step 2: fll prompt to input")
                 await fill_prompt.execute_fill_prompt_to_input(prompt, type_prompt)
@@ -75,7 +85,9 @@ class VideoGenerator:
 
                 elif type_prompt == "thumbnail":
                     logger.info("Step 4: Wait for thumbnail to generate")
-                    await down_thumb.execute_wait_for_thumbnail_to_generate(prompt)
+                    # Cache for the download step
+                    self._last_thumbnail_src = await down_thumb.execute_wait_for_thumbnail_to_generate(prompt)
+                    self._last_thumbnail_prompt = prompt
 
                     logger.info("Step 5: Download thumbnail")
                     file_path = await down_thumb.execute_download_thumbnail(prompt)
@@ -12,7 +12,8 @@ class CheckInSpeech:
 
     async def check_in_generate_tool_speech(self, email_text: str) -> bool:
         await self.tab.get(self.speech_url)
-        await asyncio.sleep(random.uniform(2.1, 3.1))
+        # Short jitter only: the close-icon click below already waits for the page
+        await asyncio.sleep(random.uniform(0.2, 0.6))
         try:
             logger.info("Start Click 'X' in Google Speech")
             await UtilActions.click(
@@ -1,3 +1,4 @@
+import asyncio
 import os
 import uuid
 from typing import Optional
@@ -6,16 +7,91 @@ import nodriver as nd
 from loguru import logger
 from nodrive_gpm_package.utils import UtilActions, UtilDownloadFile
 
+from workers.no_drive_services.web_page_services.media_download import download_media
+from workers.no_drive_services.web_page_services.page_script import evaluate_value
+
+_GENERATED_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "generated")
+_VOICE_STORE_ROOT = os.path.join(_GENERATED_DIR, "voices")
+
 
 class DownloadAudio:
-    def __init__(self, tab, account):
+    # Resolves true once no 'Stop' button is left (generation finished), driven by a
+    # MutationObserver; resolves false when the watch times out so it can be re-armed
+    WAIT_STOP_GONE_JS = """
+        new Promise(resolve => {
+            const stopShown = () => Array.prototype.some.call(
+                document.querySelectorAll('button[type="button"] span'),
+                span => (span.textContent || '').trim() === 'Stop'
+            );
+            if (!stopShown()) {
+                resolve(true);
+                return;
+            }
+
+            let timer = null;
+            const observer = new MutationObserver(() => {
+                if (!stopShown()) {
+                    observer.disconnect();
+                    clearTimeout(timer);
+                    resolve(true);
+                }
+            });
+            timer = setTimeout(() => {
+                observer.disconnect();
+                resolve(false);
+            }, %d);
+            observer.observe(document.body, { childList: true, subtree: true, characterData: true });
+        })
+    """
+    STOP_WATCH_TIMEOUT_MS = 30000
+    # Upper bound for one voice generation, so a stuck Stop button cannot hang the task
+    MAX_GENERATION_SECONDS = 600
+
+    def __init__(self, tab, account, dir_store: Optional[str] = None):
         self.tab = tab
         self.account_email = account
+        self.dir_store = dir_store or self.voice_dir(account)
+
+    @staticmethod
+    def voice_dir(account: str) -> str:
+        """
+        Return the directory the voices of an account are stored in.
+
+        Args:
+            account: Account email
+
+        Returns:
+            Absolute directory path
+        """
+        return os.path.join(_VOICE_STORE_ROOT, account)
 
     async def audio_wait_for_generation(self) -> None:
+        logger.info("Waiting generating...")
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.MAX_GENERATION_SECONDS
+        try:
+            expression = self.WAIT_STOP_GONE_JS % self.STOP_WATCH_TIMEOUT_MS
+            while True:
+                stop_gone = await evaluate_value(self.tab, expression, await_promise=True)
+                if stop_gone is True:
+                    break
+                # Only an explicit false means the watch timed out and must be re-armed
+                if stop_gone is not False:
+                    raise RuntimeError(f"Unexpected Stop watch result: {stop_gone!r}")
+                if loop.time() >= deadline:
+                    logger.error(f"❌ Voice still generating after {self.MAX_GENERATION_SECONDS}s, giving up waiting")
+                    return
+                logger.debug("Waiting generating...")
+        except Exception as e:
+            logger.warning(f"Stop button watcher failed, falling back to polling: {e}")
+            await self._poll_stop_gone()
+            return
+        logger.info("✅🎶 Generated voice success 🎶✅")
+
+    async def _poll_stop_gone(self) -> None:
         while True:
             try:
-                logger.info("Waiting generating...")
+                logger.debug("Waiting generating...")
                 await UtilActions.getElement(
                     tab=self.tab,
                     parentTag="button",
@@ -37,19 +113,18 @@ class DownloadAudio:
             timeout=10,
         )
         src_audio_base64 = audio_voice.attrs.get("src")  # Base 64
-        name_file = f"voice_{uuid.uuid4()}"
+        name_file = f"voice_{uuid.uuid4().hex}"
 
         try:
-            current_file_path = os.path.abspath(__file__)
-            current_dir = os.path.dirname(current_file_path)
-            dir_store = os.path.join(current_dir, "generated", "voices", self.account_email)
-
-            file_path = await UtilDownloadFile.download(
-                self.tab,
-                src_audio_base64,
-                dir_store,
-                name_file,
-            )
+            file_path = await download_media(self.tab, src_audio_base64, self.dir_store, name_file, ".wav")
+            # blob: URLs only resolve inside the page
+            if not file_path:
+                file_path = await UtilDownloadFile.download(
+                    self.tab,
+                    src_audio_base64,
+                    self.dir_store,
+                    name_file,
+                )
             logger.info(f"✅ Successfully downloaded: {file_path}")
             return file_path
         except Exception as e:
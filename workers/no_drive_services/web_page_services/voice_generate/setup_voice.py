@@ -1,4 +1,5 @@
 import asyncio
+import json
 import random
 from typing import List
 
@@ -6,37 +7,138 @@ import nodriver as nd
 from loguru import logger
 from nodrive_gpm_package.utils import UtilActions, UtilDownloadFile
 
+from workers.no_drive_services.web_page_services.page_script import evaluate_value
+
 
 class SetupVoice:
+    SPEAKER_INPUT_SELECTOR = '[id^="cdk-accordion-child-"] input[type="text"]'
+    # Opens every speaker's voice selector in turn and picks the character from its
+    # option list, all inside the page; returns an error message or null
+    SELECT_VOICES_JS = """
+        (async (character, timeoutMs) => {
+            const delay = ms => new Promise(resolve => setTimeout(resolve, ms));
+            const waitFor = async (find) => {
+                for (let waited = 0; waited <= timeoutMs; waited += 50) {
+                    const found = find();
+                    if (found) return found;
+                    await delay(50);
+                }
+                return null;
+            };
+            const findOption = () => Array.prototype.find.call(
+                document.querySelectorAll('span.mdc-list-item__primary-text div'),
+                div => (div.textContent || '').trim().startsWith(character)
+            );
+
+            const selectors = await waitFor(() => {
+                const found = document.querySelectorAll('ms-voice-selector');
+                return found.length ? found : null;
+            });
+            if (!selectors) return 'no voice selector found';
+
+            for (const selector of selectors) {
+                const rect = selector.getBoundingClientRect();
+                if (rect.top < 0 || rect.bottom > window.innerHeight) {
+                    selector.scrollIntoView({ block: 'center' });
+                }
+                const trigger = selector.querySelector('.mat-mdc-select-trigger, mat-select, [role="combobox"]') || selector;
+                trigger.click();
+
+                const option = await waitFor(findOption);
+                if (!option) return 'voice option not found: ' + character;
+                option.scrollIntoView({ block: 'nearest' });
+                (option.closest('mat-option, [role="option"]') || option).click();
+
+                // Wait for the option panel to close before opening the next selector
+                await waitFor(() => !findOption());
+            }
+            return null;
+        })(%s, %d)
+    """
+    VOICE_SELECT_TIMEOUT_MS = 10000
+    # Finds the character's option in the open list with one query and clicks it;
+    # resolves to whether the option was found before the timeout
+    CLICK_VOICE_OPTION_JS = """
+        (async (character, timeoutMs) => {
+            for (let waited = 0; waited <= timeoutMs; waited += 50) {
+                const option = Array.prototype.find.call(
+                    document.querySelectorAll('span.mdc-list-item__primary-text div'),
+                    div => (div.textContent || '').trim().startsWith(character)
+                );
+                if (option) {
+                    option.scrollIntoView({ block: 'nearest' });
+                    (option.closest('mat-option, [role="option"]') || option).click();
+                    return true;
+                }
+                await new Promise(resolve => setTimeout(resolve, 50));
+            }
+            return false;
+        })(%s, %d)
+    """
+    # True when the element is fully inside the viewport, so no scroll is needed
+    IN_VIEWPORT_JS = """
+        (el) => {
+            const rect = el.getBoundingClientRect();
+            return rect.top >= 0 && rect.bottom <= window.innerHeight;
+        }
+    """
+    RUN_SETTINGS_OPEN_JS = """
+        (() => Array.prototype.some.call(
+            document.querySelectorAll('h2'),
+            h2 => (h2.textContent || '').includes('Run settings')
+        ))()
+    """
+    RUN_SETTINGS_OPEN_TIMEOUT = 3  # seconds
+
     def __init__(self, tab, account):
         self.tab = tab
         self.account_email = account
+        # Elements that stay on the page between generations, keyed by role
+        self._element_cache: dict[str, nd.Element] = {}
+
+    async def _cached_get(self, key: str, **kwargs) -> nd.Element:
+        """
+        Return the element cached under key while it is still attached, else look it up again.
+
+        Args:
+            key: Role of the element (cache key)
+            **kwargs: UtilActions.getElement arguments (tab excluded)
+
+        Returns:
+            The element
+        """
+        element = self._element_cache.get(key)
+        if element is not None:
+            try:
+                if await element.apply("(el) => el.isConnected"):
+                    return element
+            except Exception:
+                pass
+        element = await UtilActions.getElement(tab=self.tab, **kwargs)
+        self._element_cache[key] = element
+        return element
 
     async def set_open_run_settings(self) -> None:
-        try:
-            await UtilActions.getElement(
-                tab=self.tab,
-                rootTag="h2",
-                text="Run settings",
-                timeout=3,
-            )
-        except:
-            await asyncio.sleep(1)
-            run_settings: nd.Element = await UtilActions.getElement(
-                tab=self.tab,
-                rootTag="button",
-                attributes={"aria-label": "Toggle run settings panel"},
-                timeout=3,
-            )
-            await run_settings.click()
-            await asyncio.sleep(1)
+        # The toggle is rendered whether the panel is open or not, so once it exists
+        # a single probe tells the state without waiting out a lookup timeout
+        run_settings: nd.Element = await self._cached_get(
+            "run_settings_toggle",
+            rootTag="button",
+            attributes={"aria-label": "Toggle run settings panel"},
+            timeout=3,
+        )
+        if await evaluate_value(self.tab, self.RUN_SETTINGS_OPEN_JS):
+            return
 
-            await UtilActions.getElement(
-                tab=self.tab,
-                rootTag="h2",
-                text="Run settings",
-                timeout=3,
-            )
+        await run_settings.click()
+
+        # Gates on the panel being open, no fixed sleep needed
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.RUN_SETTINGS_OPEN_TIMEOUT
+        while not await evaluate_value(self.tab, self.RUN_SETTINGS_OPEN_JS):
+            if loop.time() >= deadline:
+                raise Exception("Run settings panel did not open")
+            await asyncio.sleep(0.05)
 
     async def set_enable_multi_speaker_audio(self) -> None:
         try:
@@ -88,6 +190,21 @@ class SetupVoice:
             )
 
     async def set_select_voice_character(self, character: str) -> None:
+        try:
+            error = await evaluate_value(
+                self.tab,
+                self.SELECT_VOICES_JS % (json.dumps(character), self.VOICE_SELECT_TIMEOUT_MS),
+                await_promise=True,
+            )
+        except Exception as e:
+            error = str(e)
+        if error is None:
+            return
+
+        logger.warning(f"Batched voice selection failed ({error}), selecting one by one")
+        await self._select_voice_character_by_clicks(character)
+
+    async def _select_voice_character_by_clicks(self, character: str) -> None:
         list_selected_voice: List[nd.Element] = await UtilActions.getElement(
             tab=self.tab,
             rootTag="ms-voice-selector",
@@ -95,16 +212,19 @@ class SetupVoice:
             timeout=10,
         )
 
-        for idx, selected_voice in enumerate(list_selected_voice):
-            await selected_voice.scroll_into_view()
+        # One readiness gate for all speakers instead of a lookup per speaker
+        try:
+            await self.tab.wait_for(selector=self.SPEAKER_INPUT_SELECTOR, timeout=10)
+        except asyncio.TimeoutError:
+            logger.warning("Speaker inputs did not appear, continue action")
 
-            await UtilActions.getElement(
-                tab=self.tab,
-                parentAttributes={"id": f"cdk-accordion-child-{idx}"},
-                rootTag="input",
-                attributes={"type": "text"},
-                timeout=10,
-            )
+        for selected_voice in list_selected_voice:
+            try:
+                visible = await selected_voice.apply(self.IN_VIEWPORT_JS)
+            except Exception:
+                visible = False
+            if not visible:
+                await selected_voice.scroll_into_view()
 
             await UtilActions.clickOnElement(
                 tab=self.tab,
@@ -112,6 +232,18 @@ class SetupVoice:
                 timeDelayAction=1,
             )
 
+            try:
+                clicked = await evaluate_value(
+                    self.tab,
+                    self.CLICK_VOICE_OPTION_JS % (json.dumps(character), self.VOICE_SELECT_TIMEOUT_MS),
+                    await_promise=True,
+                )
+            except Exception as e:
+                logger.debug(f"Voice option lookup script failed: {e}")
+                clicked = False
+            if clicked is True:
+                continue
+
             await UtilActions.click(
                 tab=self.tab,
                 parentTag="span",
@@ -126,9 +258,10 @@ class SetupVoice:
 
     async def set_close_settings_panel(self) -> None:
         logger.info("Click 'X'")
-        await UtilActions.click(
-            tab=self.tab,
+        close_button: nd.Element = await self._cached_get(
+            "close_settings_panel",
             rootTag="button",
             attributes={"aria-label": "Close run settings panel"},
             timeout=10,
         )
+        await close_button.click()
@@ -4,20 +4,38 @@ from nodrive_gpm_package.utils import UtilActions, UtilDownloadFile
 
 
 class SubmitPrompt:
+    PROMPT_INPUT_SELECTOR = "textarea.multi-speaker-raw-prompt"
+
     def __init__(self, tab):
         self.tab = tab
 
     async def audio_send_prompt(self, prompt: str) -> None:
         logger.info("Send prompt")
-        await UtilActions.sendKey(
-            tab=self.tab,
-            rootTag="textarea",
-            attributes={"class": "multi-speaker-raw-prompt"},
-            contentInput=prompt,
-            typeSendKey="fast",
-            timeout=10,
-            splitKeyword="Speaker",
-        )
+        try:
+            await self._insert_prompt(prompt)
+        except Exception as e:
+            logger.warning(f"Prompt insertText failed, typing it instead: {e}")
+            await UtilActions.sendKey(
+                tab=self.tab,
+                rootTag="textarea",
+                attributes={"class": "multi-speaker-raw-prompt"},
+                contentInput=prompt,
+                typeSendKey="fast",
+                timeout=10,
+                splitKeyword="Speaker",
+            )
+
+    async def _insert_prompt(self, prompt: str) -> None:
+        """
+        Replace the prompt textarea value with one CDP Input.insertText call instead of per-key events.
+
+        Args:
+            prompt: Multi-speaker prompt text
+        """
+        textarea: nd.Element = await self.tab.select(self.PROMPT_INPUT_SELECTOR, timeout=10)
+        await textarea.clear_input()
+        await textarea.focus()
+        await self.tab.send(nd.cdp.input_.insert_text(text=prompt))
 
     async def execute_submit_generation(self) -> None:
         logger.info("Click 'Submit'")
@@ -1,5 +1,7 @@
+import asyncio
 import random
-from typing import TypedDict, List, Optional
+from functools import partial
+from typing import TypedDict, List, Optional, Tuple
 
 import nodriver as nd
 from loguru import logger
@@ -8,6 +10,7 @@ from pydantic import BaseModel
 
 from src.schemas.accounts import AccountEmail
 from src.schemas.task_aI_image_voice_canva_instagram import TaskAIImageVoiceCanvaInstagram
+from workers.no_drive_services.web_page_services.voice_generate.check_in_speech import CheckInSpeech
 from workers.no_drive_services.web_page_services.voice_generate.download_audio import DownloadAudio
 from workers.no_drive_services.web_page_services.voice_generate.setup_voice import SetupVoice
 from workers.no_drive_services.web_page_services.voice_generate.submit_prompt import SubmitPrompt
@@ -32,6 +35,8 @@ class TDataGen(BaseModel):
 
 
 list_voice_character = "Zephyr, Puck, Charon, Kore, Fenrir, Leda, Orus, Aoede, Callirrhoe, Autonoe, Enceladus, Iapetus, Umbriel, Algieba, Despina, Erinome, Algenib, Rasalgethi, Laomedeia, Achernar, Alnilam, Schedar, Gacrux, Pulcherrima, Achird, Zubenelgenubi, Vindemiatrix, Sadachbia, Sadaltager, Sulafat"
+# Parsed once at import, _get_prompt only picks from it
+VOICE_CHARACTERS = tuple(character.strip() for character in list_voice_character.split(","))
 
 
 class VoiceGenerator:
@@ -39,7 +44,18 @@ class VoiceGenerator:
         self.tab = None
         self.task_voice = None
         self.account_email = None
+        self.dir_store = None
         self.voice_login = VoiceLogin()
+        # Helpers bound to the main tab, reused across tasks while tab and account stay the same
+        self._pipeline_key: Optional[Tuple[int, str]] = None
+        self._pipeline: Optional[Tuple[SetupVoice, SubmitPrompt, DownloadAudio]] = None
+
+    def reset(self):
+        """Clear per-task state so the generator can be reused for the next task."""
+        self.tab = None
+        self.task_voice = None
+        self.account_email = None
+        self.dir_store = None
 
     async def execute_voice_generate(
             self,
@@ -50,6 +66,8 @@ class VoiceGenerator:
         self.tab = tab
         self.task_voice = task_voice
         self.account_email = account_email.email
+        # Resolved once per run, every download of this account shares it
+        self.dir_store = DownloadAudio.voice_dir(self.account_email)
 
         await self.voice_login.execute_login_google_speech(tab)
 
@@ -58,8 +76,7 @@ class VoiceGenerator:
         return await self._generate(list_data_prompt)
 
     async def _get_prompt(self) -> List[TDataGen]:
-        voice_characters = list_voice_character.split(",")
-        character = random.choice(voice_characters).strip()
+        character = random.choice(VOICE_CHARACTERS)
 
         return [
             TDataGen(
@@ -76,48 +93,112 @@ class VoiceGenerator:
             self,
             list_data_prompt: List[TDataGen],
     ) -> Optional[str]:
-        setup = SetupVoice(self.tab, self.account_email)
-        submit = SubmitPrompt(self.tab)
-        download = DownloadAudio(self.tab, self.account_email)
-
-        for data_gen in list_data_prompt:
-            logger.info(f"Step 1: Open run settings")
-            await setup.set_open_run_settings()
-
-            logger.info(f"Step 2: Select model")
-            # await self._select_model()
-
-            logger.info(f"Step 3: Enable multi-speaker audio")
-            await setup.set_enable_multi_speaker_audio()
-
-            logger.info(f"Step 4: Set temperature")
-            await setup.set_temperature()
-
-            logger.info(f"Step 5: Select voice character")
-            await setup.set_select_voice_character(data_gen.character)
-
-            logger.info(f"Step 6: Close settings panel")
-            await setup.set_close_settings_panel()
-
-            logger.info(f"Step 7: Send prompt")
-            await submit.audio_send_prompt(data_gen.prompt)
+        """
+        Generate and download one voice per prompt.
+
+        Each extra prompt gets its own Speech tab: the UI steps run one tab at a
+        time, then all generations are awaited and downloaded concurrently so the
+        model latency overlaps. Falls back to one tab when no extra tab can be opened.
+
+        Args:
+            list_data_prompt: Prompt and voice character per voice
+        """
+        extra_tabs = await self._open_extra_tabs(len(list_data_prompt) - 1)
+        if len(extra_tabs) < len(list_data_prompt) - 1:
+            for tab in extra_tabs:
+                await tab.close()
+            # One set of helpers for the whole loop, so they reuse their cached elements
+            setup, submit, download = self._main_pipeline()
+            for data_gen in list_data_prompt:
+                await self._setup_and_submit(setup, submit, data_gen)
+                await self._wait_and_download(download)
+            return None
+
+        pipelines = [self._main_pipeline(), *(self._new_pipeline(tab) for tab in extra_tabs)]
+        tabs = [self.tab, *extra_tabs]
+        try:
+            for tab, (setup, submit, _), data_gen in zip(tabs, pipelines, list_data_prompt):
+                await tab.activate()
+                await self._setup_and_submit(setup, submit, data_gen)
+            await asyncio.gather(*(self._wait_and_download(download) for _, _, download in pipelines))
+        finally:
+            for tab in extra_tabs:
+                try:
+                    await tab.close()
+                except Exception as e:
+                    logger.warning(f"Failed to close extra Speech tab: {e}")
+            await self.tab.activate()
+        return None
 
-            logger.info(f"Step 8: Submit generation")
-            await submit.execute_submit_generation()
+    def _new_pipeline(self, tab: nd.Tab) -> Tuple[SetupVoice, SubmitPrompt, DownloadAudio]:
+        return SetupVoice(tab, self.account_email), SubmitPrompt(tab), DownloadAudio(tab, self.account_email, self.dir_store)
+
+    def _main_pipeline(self) -> Tuple[SetupVoice, SubmitPrompt, DownloadAudio]:
+        """
+        Return the helpers of the main tab, built once per tab and account.
+
+        Returns:
+            (SetupVoice, SubmitPrompt, DownloadAudio) bound to self.tab
+        """
+        # The cached helpers hold the tab, so its id cannot be reused while cached
+        key = (id(self.tab), self.account_email)
+        if self._pipeline_key != key:
+            self._pipeline_key = key
+            self._pipeline = self._new_pipeline(self.tab)
+        return self._pipeline
+
+    async def _open_extra_tabs(self, count: int) -> List[nd.Tab]:
+        """
+        Open count more Speech tabs in the same browser.
+
+        Args:
+            count: Number of tabs to open
+
+        Returns:
+            The opened tabs; fewer than count if opening one failed
+        """
+        speech_url = self.tab.target.url
+        tabs = []
+        for _ in range(count):
+            try:
+                tab = await self.tab.browser.get("about:blank", new_tab=True)
+                tabs.append(tab)
+                # The terms were accepted on the first tab, only the intro dialog is left
+                await CheckInSpeech(tab, speech_url).check_in_generate_tool_speech(self.account_email)
+            except Exception as e:
+                logger.warning(f"Could not open an extra Speech tab, generating sequentially: {e}")
+                break
+        return tabs
+
+    async def _setup_and_submit(self, setup: SetupVoice, submit: SubmitPrompt, data_gen: TDataGen) -> None:
+        # Step 2 (select model) is disabled, see _select_model
+        steps = (
+            ("Step 1: Open run settings", setup.set_open_run_settings),
+            ("Step 3: Enable multi-speaker audio", setup.set_enable_multi_speaker_audio),
+            ("Step 4: Set temperature", setup.set_temperature),
+            ("Step 5: Select voice character", partial(setup.set_select_voice_character, data_gen.character)),
+            ("Step 6: Close settings panel", setup.set_close_settings_panel),
+            ("Step 7: Send prompt", partial(submit.audio_send_prompt, data_gen.prompt)),
+            ("Step 8: Submit generation", submit.execute_submit_generation),
+        )
+        for label, step in steps:
+            logger.debug(label)
+            await step()
 
-            logger.info(f"Step 9: Wait for generation")
-            await download.audio_wait_for_generation()
+    async def _wait_and_download(self, download: DownloadAudio) -> Optional[str]:
+        logger.debug("Step 9: Wait for generation")
+        await download.audio_wait_for_generation()
 
-            logger.info(f"Step 10: Download audio")
-            await download.execute_download_audio()
+        logger.debug("Step 10: Download audio")
+        file_path = await download.execute_download_audio()
 
-            logger.info(f"Step 11: Download audio success")
-        return None
+        logger.debug("Step 11: Download audio success")
+        return file_path
 
-    async def _select_model(self) -> None:
+    async def _select_model(self, tab: nd.Tab) -> None:
         logger.info("Click 'Select model'")
         await UtilActions.click(
-            tab=self.tab,
+            tab=tab,
             rootTag="div",
             attributes={"class": "settings-model-selector"},
             timeout=10,
@@ -125,7 +206,7 @@ class VoiceGenerator:
 
         logger.info("Click 'Gemini 2.5 Flash Preview TTS'")
         await UtilActions.click(
-            tab=self.tab,
+            tab=tab,
             rootTag="span",
             attributes={"class": "model-name"},
             text="Gemini 2.5 Flash Preview TTS",
@@ -6,22 +6,23 @@ from nodrive_gpm_package.utils import UtilActions
 
 
 class VoiceLogin:
-    def __init__(self):
-        self.tab = None
+    # Prompt textarea only rendered once the terms dialog is accepted
+    READY_SELECTOR = "textarea.multi-speaker-raw-prompt"
+    READY_TIMEOUT = 15
 
     async def execute_login_google_speech(self, tab: nd.Tab):
+        # The tab is passed down instead of stored, so one VoiceLogin can serve several tabs at once
         try:
-            self.tab = tab
-            await self._click_x()
-            await self._login_speech()
+            await self._click_x(tab)
+            await self._login_speech(tab)
         except Exception as e:
             logger.error("No confirm show, keep continue")
             print(e)
 
-    async def _click_x(self):
+    async def _click_x(self, tab: nd.Tab):
         logger.info("Start Click 'X'")
         await UtilActions.click(
-            tab=self.tab,  # Changed parameter name only
+            tab=tab,  # Changed parameter name only
             parentTag="button",
             rootTag="span",
             text="close-icon",
@@ -29,29 +30,26 @@ class VoiceLogin:
             isGoOnTop=True,
         )
 
-    async def _login_speech(self):
+    async def _click_checkbox(self, tab: nd.Tab, checkbox_id: str):
         await UtilActions.click(
-            tab=self.tab,  # Changed parameter name only
+            tab=tab,  # Changed parameter name only
             rootTag="input",
             attributes={
                 "type": "checkbox",
-                "id": "mat-mdc-checkbox-0-input",
+                "id": checkbox_id,
             },
             timeout=10,
             isGoOnTop=True,
         )
-        await UtilActions.click(
-            tab=self.tab,  # Changed parameter name only
-            rootTag="input",
-            attributes={
-                "type": "checkbox",
-                "id": "mat-mdc-checkbox-1-input",
-            },
-            timeout=10,
-            isGoOnTop=True,
+
+    async def _login_speech(self, tab: nd.Tab):
+        # The two consent checkboxes are independent, tick them concurrently
+        await asyncio.gather(
+            self._click_checkbox(tab, "mat-mdc-checkbox-0-input"),
+            self._click_checkbox(tab, "mat-mdc-checkbox-1-input"),
         )
         await UtilActions.click(
-            tab=self.tab,  # Changed parameter name only
+            tab=tab,  # Changed parameter name only
             parentTag="button",
             rootTag="span",
             text="I accept",
@@ -59,6 +57,9 @@ class VoiceLogin:
             timeout=10,
             isGoOnTop=True,
         )
-        await asyncio.sleep(10)
+        try:
+            await tab.wait_for(selector=self.READY_SELECTOR, timeout=self.READY_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("Speech prompt input not ready after login, keep continue")
 
     logger.info("👤👤👤 Login Google Speech Success 👤👤👤")
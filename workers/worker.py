@@ -2,7 +2,7 @@
 
 import threading
 import multiprocessing
-from time import sleep
+from time import monotonic, sleep
 from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
 from typing import Any, Optional, Dict, List
 from loguru import logger
@@ -24,6 +24,9 @@ class Worker(QObject):
     status = pyqtSignal(str)  # Emitted to report status messages
     result = pyqtSignal(dict)  # Emitted with result data
     
+    # Minimum spacing between two progress emits (~60 Hz)
+    PROGRESS_MIN_INTERVAL = 0.016
+    
     def __init__(self):
         """Initialize the worker."""
         super().__init__()
@@ -31,6 +34,7 @@ class Worker(QObject):
         self._should_stop = False
         self._threads: List[threading.Thread] = []  # Track all sub-threads
         self._processes: List[multiprocessing.Process] = []  # Track all sub-processes
+        self._last_progress_ts = 0.0
     
     @pyqtSlot()
     def run(self):
@@ -39,7 +43,7 @@ class Worker(QObject):
         
         This method is called when the thread starts. It should:
         - Perform the actual work
-        - Emit progress/status signals as needed
+        - Emit progress (via emit_progress) / status signals as needed
         - Handle errors and emit error signal
         - Emit finished signal when done
         """
@@ -74,25 +78,69 @@ class Worker(QObject):
         self._should_stop = True
         logger.info("Stop requested for worker")
         
-        # Wait for all sub-threads to finish
-        if self._threads:
-            logger.info(f"Waiting for {len(self._threads)} sub-threads to finish...")
-            for thread in self._threads:
-                if thread.is_alive():
-                    thread.join(timeout=1.0)  # Wait up to 1 second per thread
+        # Wait for all sub-threads to finish, sharing one deadline instead of 1s per thread
+        threads = self._prune_finished(self._threads)
+        if threads:
+            logger.info(f"Waiting for {len(threads)} sub-threads to finish...")
+            self._join_all(threads, timeout=1.0)
         
         # Wait for all sub-processes to finish
-        if self._processes:
-            logger.info(f"Waiting for {len(self._processes)} sub-processes to finish...")
-            for process in self._processes:
+        processes = self._prune_finished(self._processes)
+        if processes:
+            logger.info(f"Waiting for {len(processes)} sub-processes to finish...")
+            self._join_all(processes, timeout=2.0)
+            stuck = [process for process in processes if process.is_alive()]
+            for process in stuck:
+                logger.warning(f"Process {process.pid} did not stop, terminating")
+                process.terminate()
+            self._join_all(stuck, timeout=1.0)
+            for process in stuck:
                 if process.is_alive():
-                    process.join(timeout=2.0)  # Wait up to 2 seconds per process
-                    if process.is_alive():
-                        logger.warning(f"Process {process.pid} did not stop, terminating")
-                        process.terminate()
-                        process.join(timeout=1.0)
-                        if process.is_alive():
-                            process.kill()
+                    process.kill()
+    
+    @staticmethod
+    def _prune_finished(items: list) -> list:
+        """
+        Drop finished threads/processes from a tracking list in place.
+        
+        Args:
+            items: Tracked threads or processes
+            
+        Returns:
+            The same list, now holding only the alive entries
+        """
+        items[:] = [item for item in items if item.is_alive()]
+        return items
+    
+    @staticmethod
+    def _join_all(items: list, timeout: float):
+        """
+        Join threads/processes against one shared deadline.
+        
+        Args:
+            items: Threads or processes to join
+            timeout: Total time to wait for all of them (seconds)
+        """
+        deadline = monotonic() + timeout
+        for item in items:
+            remaining = deadline - monotonic()
+            if remaining <= 0:
+                break
+            item.join(timeout=remaining)
+    
+    def emit_progress(self, value: int):
+        """
+        Emit the progress signal, dropping updates that come faster than the GUI can use.
+        
+        Start (0) and completion (100) are always emitted.
+        
+        Args:
+            value: Progress value (0-100)
+        """
+        now = monotonic()
+        if value in (0, 100) or now - self._last_progress_ts >= self.PROGRESS_MIN_INTERVAL:
+            self._last_progress_ts = now
+            self.progress.emit(value)
     
     def is_running(self) -> bool:
         """Check if the worker is currently running."""
@@ -119,6 +167,8 @@ class Worker(QObject):
             kwargs = {}
         thread = threading.Thread(target=target, args=args, kwargs=kwargs, daemon=daemon)
         thread.start()
+        # Forget finished threads so the list does not grow for long-lived workers
+        self._prune_finished(self._threads)
         self._threads.append(thread)
         return thread
     
@@ -149,6 +199,7 @@ class Worker(QObject):
             kwargs = {}
         process = multiprocessing.Process(target=target, args=args, kwargs=kwargs, daemon=True)
         process.start()
+        self._prune_finished(self._processes)
         self._processes.append(process)
         return process
     